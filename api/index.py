@@ -11,14 +11,28 @@ sys.path.insert(0, str(src_dir))
 try:
     from fastmcp import FastMCP
 
+    from admission import admission
     from auth.mcv import MCVProvider
-    from routes import admins, courses, root, users
+    from cache.response import response_cache
+    from cache.warmup import warmup
+    from config.contants import (
+        ADMISSION_ENABLED,
+        RESPONSE_CACHE_SHARED,
+        TOOL_STRUCTURED_CONTENT,
+    )
+    from lifespan import lifespan
+    from routes import lazy, metrics, resources, root
+    from storage.factory import create_storage
+    from transport import ResultMiddleware, http_middleware
+    from utils.fastjson import dumps
 
     # Get environment variables
     APP_NAME = os.getenv("APP_NAME", "mcv-mcp-server")
     MCV_CLIENT_ID = os.getenv("MCV_CLIENT_ID", "")
     MCV_CLIENT_SECRET = os.getenv("MCV_CLIENT_SECRET", "")
     MCV_REDIRECT_PATH = os.getenv("MCV_REDIRECT_PATH", "/callback")
+    # Register tools from precomputed schemas and import controllers on first call
+    FAST_STARTUP = os.getenv("FAST_STARTUP", "true").lower() == "true"
 
     # Determine base URL
     base_url = os.getenv("VERCEL_URL")
@@ -27,11 +41,16 @@ try:
     else:
         base_url = os.getenv("BASE_URL", "http://localhost:8000")
 
+    # Shared, encrypted OAuth storage (set STORAGE_BACKEND=redis on Vercel)
+    storage = create_storage()
+    if RESPONSE_CACHE_SHARED:
+        response_cache.storage = storage
+
     # Initialize auth provider
     auth = MCVProvider(
         client_id=MCV_CLIENT_ID,
         client_secret=MCV_CLIENT_SECRET,
-        client_storage=None,
+        client_storage=storage,
         base_url=base_url,
         redirect_path=MCV_REDIRECT_PATH,
         allowed_client_redirect_uris=[
@@ -42,33 +61,49 @@ try:
         ],
     )
 
+    # Prefetch course data for users who just logged in (WARMUP_ENABLED)
+    warmup.attach(auth)
+
     # Create FastMCP instance
-    mcp = FastMCP(APP_NAME, auth=auth)
+    mcp = FastMCP(APP_NAME, auth=auth, lifespan=lifespan, tool_serializer=dumps)
+    if ADMISSION_ENABLED:
+        mcp.add_middleware(admission)
+    mcp.add_middleware(ResultMiddleware(TOOL_STRUCTURED_CONTENT))
 
     # Register routes
     root.register(mcp)
-    users.register(mcp)
-    courses.register(mcp)
-    admins.register(mcp)
+    metrics.register(mcp)
+    if not (FAST_STARTUP and lazy.register(mcp)):
+        from routes import admins, courses, deadlines, query, sync, users
+
+        users.register(mcp)
+        courses.register(mcp)
+        admins.register(mcp)
+        sync.register(mcp)
+        deadlines.register(mcp)
+        query.register(mcp)
+    resources.register(mcp)
 
     # Export app for Vercel
-    app = mcp.app
+    app = mcp.http_app(middleware=http_middleware())
 
 except Exception as e:
     # Fallback simple app for debugging
     from fastapi import FastAPI
 
+    error = str(e)
+
     app = FastAPI()
 
     @app.get("/")
     def health():
         return {
             "status": "error",
-            "message": str(e),
+            "message": error,
             "python_path": sys.path,
             "cwd": os.getcwd(),
         }
 
     @app.get("/health")
     def health_check():
-        return {"status": "error", "details": str(e)}
+        return {"status": "error", "details": error}
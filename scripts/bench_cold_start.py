@@ -0,0 +1,111 @@
+"""Measure cold-start time of the Vercel entry point (api/index.py).
+
+Each run starts a fresh interpreter, imports api/index.py and lists the tools,
+then reports interpreter, import and first tools/list times. Compare
+FAST_STARTUP on and off, or fail CI when the import time regresses:
+
+    uv run scripts/bench_cold_start.py --runs 10
+    uv run scripts/bench_cold_start.py --compare
+    uv run scripts/bench_cold_start.py --max-import 1.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {api!r})
+import index
+imported = time.perf_counter()
+if not hasattr(index, "mcp"):
+    print(json.dumps({{"error": index.error}}))
+    sys.exit(1)
+tools = asyncio.run(index.mcp.get_tools())
+listed = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "list_tools": listed - imported,
+    "tools": len(tools),
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def run_once(fast: bool) -> dict:
+    env = {
+        "MCV_CLIENT_ID": "bench-client-id",
+        "MCV_CLIENT_SECRET": "bench-client-secret",
+        "STORAGE_BACKEND": "memory",
+        **os.environ,
+        "FAST_STARTUP": "true" if fast else "false",
+    }
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(api=str(ROOT / "api"))],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT,
+    )
+    total = time.perf_counter() - start
+    lines = out.stdout.strip().splitlines()
+    if not lines:
+        raise RuntimeError(out.stderr)
+    result = json.loads(lines[-1])
+    if "error" in result:
+        raise RuntimeError(f"api/index.py failed to start: {result['error']}")
+    result["process"] = total
+    return result
+
+
+def bench(fast: bool, runs: int) -> dict:
+    results = [run_once(fast) for _ in range(runs)]
+    summary = {"fast_startup": fast, "tools": results[0]["tools"], "modules": results[0]["modules"]}
+    for key in ("process", "import", "list_tools"):
+        values = [r[key] for r in results]
+        summary[key] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def report(summary: dict) -> None:
+    mode = "on" if summary["fast_startup"] else "off"
+    print(f"FAST_STARTUP={mode}: {summary['tools']} tools, {summary['modules']} modules loaded")
+    for key in ("process", "import", "list_tools"):
+        s = summary[key]
+        print(f"  {key:<10} median {s['median'] * 1000:8.1f} ms  (min {s['min'] * 1000:.1f}, max {s['max'] * 1000:.1f})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--slow", action="store_true", help="benchmark with FAST_STARTUP=false")
+    parser.add_argument("--compare", action="store_true", help="benchmark both modes")
+    parser.add_argument("--max-import", type=float, help="fail if median import time exceeds this many seconds")
+    args = parser.parse_args()
+
+    modes = [True, False] if args.compare else [not args.slow]
+    failed = False
+    for fast in modes:
+        summary = bench(fast, args.runs)
+        report(summary)
+        if args.max_import is not None and summary["import"]["median"] > args.max_import:
+            print(f"  import time exceeds {args.max_import:.2f}s budget")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Measure response-cache memory per user, with and without compact entries.
+
+Fills a ``ResponseCache`` the way tool calls do for many users: the course
+list, and the info, materials, assignments and announcements of each of the
+user's courses, with a roster for some courses. Users are enrolled in
+overlapping courses from a shared pool, and every response is decoded
+separately, as it is when each user fetches it. Reports traced bytes per user
+for raw dicts (``RESPONSE_CACHE_COMPACT=false``) and compact entries, plus
+the cost of a cache hit:
+
+    uv run scripts/bench_memory.py
+    uv run scripts/bench_memory.py --users 500 --courses 8 --pool 40 --items 30
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from mock_mcv import DEPARTMENTS, MockMCV  # noqa: E402
+from cache.response import ResponseCache  # noqa: E402
+from utils.fastjson import loads  # noqa: E402
+
+TEXT_FIELDS = {"description", "syllabus", "instruction", "content"}
+ENDPOINTS = {
+    "/get/course/materials": "material",
+    "/get/course/assignments": "assignment",
+    "/get/course/announcements": "announcement",
+}
+
+
+def upstream(args: argparse.Namespace) -> dict[tuple[str, int], bytes]:
+    """Encoded upstream bodies per (endpoint, course), shared by every user."""
+    mock = MockMCV(args)
+    bodies = {}
+    for cv_cid in range(1, args.pool + 1):
+        bodies["/get/course/info", cv_cid] = {
+            **mock.course(cv_cid), "description": mock.text(), "syllabus": mock.text()
+        }
+        for path, kind in ENDPOINTS.items():
+            bodies[path, cv_cid] = mock.items(cv_cid, kind)
+        bodies["/get/course/roster", cv_cid] = [
+            {
+                "uid": 100_000 + i,
+                "student_id": f"65{cv_cid:03d}{i:05d}",
+                "firstname_en": f"Student{i}",
+                "lastname_en": "Mock",
+                "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+                "year": 1 + i % 4,
+                "section": 1 + i % 3,
+                "role": "student",
+            }
+            for i in range(args.roster)
+        ]
+    bodies["/get/user/courses", 0] = {"student": [mock.course(c) for c in range(1, args.pool + 1)]}
+    # The mock repeats one HTML snippet everywhere; real descriptions differ
+    # per item (but are the same for every student of the course).
+    for (path, cv_cid), data in bodies.items():
+        for n, item in enumerate(data if isinstance(data, list) else [data]):
+            for field in TEXT_FIELDS & item.keys():
+                item[field] = f"{item[field]} [{path} {cv_cid} {n}]"
+    return {
+        key: json.dumps({"status": "success", "data": data}, ensure_ascii=False).encode()
+        for key, data in bodies.items()
+    }
+
+
+async def fill(cache: ResponseCache, bodies: dict, args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    courses_body = loads(bodies["/get/user/courses", 0])
+    for user in range(args.users):
+        user_id = f"user-{user}"
+        enrolled = rng.sample(range(1, args.pool + 1), args.courses)
+        courses = {
+            **courses_body,
+            "data": {"student": [c for c in courses_body["data"]["student"] if c["cv_cid"] in enrolled]},
+        }
+        raw = json.dumps(courses, ensure_ascii=False).encode()
+        await cache.get_or_fetch(user_id, "/get/user/courses", {"detail": 1}, _loader(raw))
+        for cv_cid in enrolled:
+            paths = ["/get/course/info", *ENDPOINTS]
+            if rng.random() < args.roster_share:
+                paths.append("/get/course/roster")
+            for path in paths:
+                params = {"cv_cid": str(cv_cid)}
+                await cache.get_or_fetch(user_id, path, params, _loader(bodies[path, cv_cid]))
+
+
+def _loader(raw: bytes):
+    async def load():
+        return loads(raw)
+
+    return load
+
+
+async def measure(compact: bool, bodies: dict, args: argparse.Namespace) -> tuple[int, float, int]:
+    cache = ResponseCache(maxsize=10**7, compact=compact)
+    gc.collect()
+    tracemalloc.start()
+    await fill(cache, bodies, args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    keys = list(cache._local._data)[: args.hits]
+    start = time.perf_counter()
+    for k in keys:
+        await cache._read(k)
+    per_hit = (time.perf_counter() - start) / max(len(keys), 1)
+    return size, per_hit, len(cache._local)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--courses", type=int, default=6, help="courses per user")
+    parser.add_argument("--pool", type=int, default=40, help="distinct courses")
+    parser.add_argument("--items", type=int, default=20, help="items per course list")
+    parser.add_argument("--text-size", type=int, default=300, help="characters of HTML per item")
+    parser.add_argument("--roster", type=int, default=120, help="students per roster")
+    parser.add_argument("--roster-share", type=float, default=0.1, help="share of courses whose roster is cached")
+    parser.add_argument("--hits", type=int, default=2000, help="cache reads timed")
+    args = parser.parse_args()
+    args.latency = args.jitter = args.error_rate = 0
+
+    bodies = upstream(args)
+    results = {}
+    for compact in (False, True):
+        size, per_hit, entries = await measure(compact, bodies, args)
+        results[compact] = size
+        print(
+            f"compact={str(compact).lower():<5}  {entries} entries  "
+            f"{size / args.users / 1024:8.1f} KiB per user  "
+            f"{size / 1024 / 1024:7.1f} MiB total  {per_hit * 1e6:6.1f} us per hit"
+        )
+    print(f"compact entries use {results[True] / results[False]:.0%} of the memory")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
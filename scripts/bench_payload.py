@@ -0,0 +1,143 @@
+"""Measure bytes and CPU per tool call through the result serialization path.
+
+Runs mock-sized MyCourseVille payloads through what a tool call costs the
+server: decoding the upstream body, FastMCP turning the result into a
+``CallToolResult``, the JSON-RPC message written to the SSE stream and, with
+compression, gzip. Measures each change on its own against the
+stdlib/default path: ``utils.fastjson`` decoding, its tool serializer (only
+different from FastMCP's default with the ``fast-json`` extra), no structured
+content and gzip. The mock repeats the same HTML in every item, so real
+payloads compress less than these do:
+
+    uv run scripts/bench_payload.py
+    uv run scripts/bench_payload.py --items 100 --text-size 2000 --runs 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import httpx
+from fastmcp.tools.tool import FunctionTool
+from mcp.types import CallToolResult, JSONRPCResponse
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from mock_mcv import DEPARTMENTS, MockMCV  # noqa: E402
+from utils import fastjson  # noqa: E402
+
+# (name, stdlib decode, tool serializer, structured content, gzip); each
+# variant changes one thing from "before" unless it says otherwise.
+VARIANTS = [
+    ("before", True, None, True, False),
+    ("fast decode", False, None, True, False),
+    ("fast decode + serializer", False, fastjson.dumps, True, False),
+    ("no structured", True, None, False, False),
+    ("gzip", True, None, True, True),
+    ("no structured + gzip", True, None, False, True),
+]
+
+
+def payloads(args: argparse.Namespace) -> dict[str, bytes]:
+    """Upstream response bodies, encoded the way the mock (Starlette) sends them."""
+    mock = MockMCV(args)
+    roster = [
+        {
+            "uid": 100_000 + i,
+            "student_id": f"6500{i:05d}",
+            "firstname_en": f"Student{i}",
+            "lastname_en": "Mock",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "year": 1 + i % 4,
+            "section": 1 + i % 3,
+            "role": "student",
+        }
+        for i in range(args.roster)
+    ]
+    bodies = {
+        "get_course_materials": mock.items(1, "material"),
+        "get_student_roster": roster,
+        "get_all_materials": [
+            item for cv_cid in range(1, args.courses + 1) for item in mock.items(cv_cid, "material")
+        ],
+    }
+    return {
+        name: json.dumps({"status": "success", "data": data}, ensure_ascii=False).encode()
+        for name, data in bodies.items()
+    }
+
+
+def make_tool(variant: tuple, raw: bytes) -> FunctionTool:
+    _, stdlib, serializer, _, _ = variant
+
+    def bench_tool():
+        # What the MyCourseVille client does with the upstream body
+        return httpx.Response(200, content=raw).json() if stdlib else fastjson.loads(raw)
+
+    return FunctionTool.from_function(bench_tool, serializer=serializer)
+
+
+async def call(tool: FunctionTool, variant: tuple) -> bytes:
+    _, _, _, structured, gzip = variant
+    result = await tool.run({})
+    if not structured:
+        result.structured_content = None
+    content, structured_content = result.to_mcp_result() if result.structured_content else (result.content, None)
+    message = JSONRPCResponse(
+        jsonrpc="2.0",
+        id=1,
+        result=CallToolResult(content=content, structuredContent=structured_content).model_dump(
+            by_alias=True, mode="json", exclude_none=True
+        ),
+    )
+    body = f"event: message\r\ndata: {message.model_dump_json(by_alias=True, exclude_none=True)}\r\n\r\n".encode()
+    if gzip:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        body = compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return body
+
+
+async def bench(raw: bytes, variant: tuple, runs: int) -> tuple[int, float]:
+    tool = make_tool(variant, raw)
+    size = len(await call(tool, variant))
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        await call(tool, variant)
+        times.append(time.process_time() - start)
+    return size, statistics.median(times)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=30, help="items per course list")
+    parser.add_argument("--text-size", type=int, default=600, help="characters of HTML per item")
+    parser.add_argument("--courses", type=int, default=8)
+    parser.add_argument("--roster", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    args.latency = args.jitter = args.error_rate = 0
+
+    print(f"JSON backend: {fastjson.BACKEND}")
+    if fastjson.BACKEND != "orjson":
+        print("The serializer is FastMCP's default without orjson; install the fast-json extra to measure it.")
+    for name, raw in payloads(args).items():
+        print(f"\n{name}: upstream body {len(raw) / 1024:.1f} KiB")
+        baseline = None
+        for variant in VARIANTS:
+            size, cpu = await bench(raw, variant, args.runs)
+            baseline = baseline or (size, cpu)
+            print(
+                f"  {variant[0]:<26} {size / 1024:8.1f} KiB ({size / baseline[0]:4.0%})"
+                f"  {cpu * 1000:7.2f} ms CPU ({cpu / baseline[1]:4.0%})"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""Regenerate src/routes/tool_schemas.json from the registered tools.
+
+Usage:
+    uv run scripts/build_tool_schemas.py          # write the file
+    uv run scripts/build_tool_schemas.py --check  # fail if it is out of date
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fastmcp import FastMCP  # noqa: E402
+
+from routes import admins, courses, deadlines, lazy, query, sync, users  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only verify the file is current")
+    args = parser.parse_args()
+
+    mcp = FastMCP("tool-schemas")
+    users.register(mcp)
+    courses.register(mcp)
+    admins.register(mcp)
+    sync.register(mcp)
+    deadlines.register(mcp)
+    query.register(mcp)
+    content = json.dumps(asyncio.run(lazy.dump_schemas(mcp)), indent=2, ensure_ascii=False) + "\n"
+
+    current = lazy.SCHEMA_PATH.read_text(encoding="utf-8") if lazy.SCHEMA_PATH.exists() else ""
+    if args.check:
+        if current != content:
+            print(f"{lazy.SCHEMA_PATH} is out of date, run scripts/build_tool_schemas.py")
+            return 1
+        print(f"{lazy.SCHEMA_PATH} is up to date")
+        return 0
+
+    lazy.SCHEMA_PATH.write_text(content, encoding="utf-8")
+    print(f"Wrote {lazy.SCHEMA_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
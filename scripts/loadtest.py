@@ -0,0 +1,172 @@
+"""Load test for the MCP streamable-HTTP endpoint.
+
+Simulates many concurrent MCP clients, each with its own bearer token (so
+each is a different MyCourseVille user), calling a weighted mix of tools for
+a fixed duration. Reports per-tool and overall p50/p95/p99 latency,
+throughput, errors, and the upstream calls counted by the mock server.
+
+    uv run scripts/mock_mcv.py --port 9000 &
+    MCV_BASE_URL=http://127.0.0.1:9000 AUTH_MODE=token uv run src/server.py &
+    uv run scripts/loadtest.py --clients 50 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+# (tool, weight); arguments are filled in per call by _arguments
+MIX = [
+    ("list_all_courses", 2),
+    ("get_course_infos", 2),
+    ("get_course_assignments", 3),
+    ("get_course_materials", 2),
+    ("get_course_announcements", 2),
+    ("get_all_assignments", 1),
+]
+
+
+def _arguments(tool: str, courses: int) -> dict:
+    if tool in ("list_all_courses",) or tool.startswith("get_all_"):
+        return {}
+    return {"courseId": str(random.randint(1, courses))}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+async def simulated_client(
+    index: int,
+    args: argparse.Namespace,
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    transport = StreamableHttpTransport(args.url, auth=f"bench-user-{index}")
+    tools, weights = zip(*MIX)
+    async with Client(transport, timeout=args.timeout) as client:
+        while time.perf_counter() < deadline:
+            tool = random.choices(tools, weights)[0]
+            start = time.perf_counter()
+            try:
+                await client.call_tool(tool, _arguments(tool, args.courses))
+            except Exception:
+                errors[tool] += 1
+            else:
+                latencies[tool].append(time.perf_counter() - start)
+            if args.think:
+                await asyncio.sleep(random.uniform(0, args.think / 1000))
+
+
+async def upstream_stats(url: str | None, reset: bool = False) -> dict | None:
+    if not url:
+        return None
+    async with httpx.AsyncClient() as http:
+        try:
+            if reset:
+                resp = await http.post(f"{url}/stats/reset")
+            else:
+                resp = await http.get(f"{url}/stats")
+            return resp.json()
+        except httpx.HTTPError:
+            return None
+
+
+def report(latencies: dict[str, list[float]], errors: dict[str, int], elapsed: float, upstream: dict | None) -> dict:
+    all_latencies = [v for values in latencies.values() for v in values]
+    calls = len(all_latencies)
+
+    def summary(values: list[float]) -> dict:
+        return {
+            "calls": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+        }
+
+    result = {
+        "duration_s": elapsed,
+        "throughput_rps": calls / elapsed if elapsed else 0.0,
+        "errors": sum(errors.values()),
+        "overall": summary(all_latencies),
+        "tools": {tool: {**summary(values), "errors": errors.get(tool, 0)} for tool, values in sorted(latencies.items())},
+    }
+    if upstream is not None:
+        result["upstream_calls"] = upstream.get("total", 0)
+        result["upstream_calls_per_tool_call"] = upstream.get("total", 0) / calls if calls else 0.0
+        result["upstream_by_path"] = upstream.get("by_path", {})
+    return result
+
+
+def print_report(result: dict) -> None:
+    print(f"duration    {result['duration_s']:.1f}s")
+    print(f"throughput  {result['throughput_rps']:.1f} calls/s")
+    print(f"errors      {result['errors']}")
+    header = f"{'tool':<28}{'calls':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for tool, s in result["tools"].items():
+        print(f"{tool:<28}{s['calls']:>8}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['errors']:>8}")
+    o = result["overall"]
+    print(f"{'overall':<28}{o['calls']:>8}{o['p50_ms']:>10.1f}{o['p95_ms']:>10.1f}{o['p99_ms']:>10.1f}{result['errors']:>8}")
+    if "upstream_calls" in result:
+        print(f"upstream    {result['upstream_calls']} calls ({result['upstream_calls_per_tool_call']:.2f} per tool call)")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    await upstream_stats(args.mock_url, reset=True)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    clients = []
+    for i in range(args.clients):
+        clients.append(asyncio.create_task(simulated_client(i, args, deadline, latencies, errors)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.clients)
+    results = await asyncio.gather(*clients, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if isinstance(r, BaseException)]
+    if failed:
+        print(f"{len(failed)} clients failed to connect: {failed[0]!r}")
+    return report(latencies, errors, elapsed, await upstream_stats(args.mock_url))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the MCP streamable-HTTP endpoint")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/mcp")
+    parser.add_argument("--mock-url", default="http://127.0.0.1:9000", help="mock MyCourseVille base URL ('' to skip upstream stats)")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent simulated clients")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run")
+    parser.add_argument("--ramp", type=float, default=2, help="seconds over which clients connect")
+    parser.add_argument("--think", type=float, default=0, help="max think time between calls in ms")
+    parser.add_argument("--courses", type=int, default=6, help="course ids to pick from (match mock --courses)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
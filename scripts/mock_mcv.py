@@ -0,0 +1,202 @@
+"""Local stand-in for the MyCourseVille public API, for offline benchmarks.
+
+Serves the endpoints the controllers use with generated data, a tunable
+response latency and tunable payload sizes, and counts every request so load
+tests can report how many upstream calls the server made.
+
+    uv run scripts/mock_mcv.py --port 9000 --latency 80 --jitter 40 --items 30
+
+Then start the server against it with token auth:
+
+    MCV_BASE_URL=http://127.0.0.1:9000 AUTH_MODE=token uv run src/server.py
+
+Any bearer token is accepted; the user id is derived from the token, so
+different tokens behave as different users. ``GET /stats`` returns request
+counts per endpoint and ``POST /stats/reset`` clears them.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from collections import Counter
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+API = "/api/v1/public"
+DEPARTMENTS = ["Computer Engineering", "Electrical Engineering", "Industrial Engineering", "Chemical Engineering"]
+LOREM = (
+    "<p>Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit. "
+    "Integer posuere erat a ante venenatis dapibus.</p>"
+)
+
+
+class MockMCV:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.calls: Counter[str] = Counter()
+        self.started = time.time()
+
+    async def delay(self) -> None:
+        latency = self.args.latency + random.uniform(-self.args.jitter, self.args.jitter)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+        if self.args.error_rate and random.random() < self.args.error_rate:
+            raise _MockError()
+
+    def user_id(self, request: Request) -> int | None:
+        auth = request.headers.get("Authorization", "")
+        if not auth.startswith("Bearer ") or len(auth) <= len("Bearer "):
+            return None
+        return zlib.crc32(auth.encode()) % 1_000_000
+
+    def text(self) -> str:
+        return LOREM * max(1, self.args.text_size // len(LOREM))
+
+    def course(self, cv_cid: int) -> dict:
+        return {
+            "cv_cid": cv_cid,
+            "course_no": f"2110{cv_cid:03d}",
+            "year": 2025,
+            "semester": 1,
+            "section": 1 + cv_cid % 3,
+            "title": f"Mock Course {cv_cid}",
+            "course_icon": f"https://example.com/icons/{cv_cid}.png",
+        }
+
+    def items(self, cv_cid: int, kind: str) -> list[dict]:
+        now = int(self.started)
+        items = []
+        for i in range(self.args.items):
+            itemid = cv_cid * 10_000 + i
+            item = {"itemid": itemid, "cv_cid": cv_cid, "title": f"{kind.title()} {i} of course {cv_cid}"}
+            if kind == "assignment":
+                item.update(
+                    {
+                        "instruction": self.text(),
+                        "duetime": now + (i - self.args.items // 3) * 86_400 + cv_cid * 3_600,
+                        "status": "published",
+                    }
+                )
+            elif kind == "announcement":
+                item.update({"content": self.text(), "createdtime": now - i * 43_200 - cv_cid * 600})
+            elif kind == "material":
+                item.update(
+                    {
+                        "description": self.text(),
+                        "created": now - i * 86_400,
+                        "filename": f"lecture-{i}.pdf",
+                        "fileurl": f"https://example.com/files/{itemid}.pdf",
+                    }
+                )
+            elif kind == "meeting":
+                item.update({"start_time": now + i * 7 * 86_400, "link": f"https://meet.example.com/{itemid}"})
+            items.append(item)
+        return items
+
+    async def handle(self, request: Request) -> JSONResponse:
+        path = request.url.path[len(API):]
+        self.calls[path] += 1
+        user_id = self.user_id(request)
+        if user_id is None:
+            return JSONResponse({"status": "error", "message": "unauthorized"}, status_code=401)
+        try:
+            await self.delay()
+        except _MockError:
+            return JSONResponse({"status": "error"}, status_code=503)
+
+        params = request.query_params
+        cv_cid = int(params.get("cv_cid", 0) or 0)
+
+        if path == "/users/me":
+            data = {
+                "user": {
+                    "id": user_id,
+                    "firstname_en": f"User{user_id}",
+                    "lastname_en": "Mock",
+                    "firstname_th": "ผู้ใช้",
+                    "lastname_th": "ทดสอบ",
+                }
+            }
+            return JSONResponse(data)
+        if path == "/get/user/courses":
+            data = {"student": [self.course(c) for c in range(1, self.args.courses + 1)]}
+        elif path == "/get/course/info":
+            data = {**self.course(cv_cid), "description": self.text(), "syllabus": self.text()}
+        elif path == "/get/course/materials":
+            data = self.items(cv_cid, "material")
+        elif path == "/get/course/assignments":
+            data = self.items(cv_cid, "assignment")
+        elif path == "/get/course/announcements":
+            data = self.items(cv_cid, "announcement")
+        elif path == "/get/course/onlinemeetings":
+            data = self.items(cv_cid, "meeting")
+        elif path == "/get/course/playlists":
+            data = [{"playlist_id": cv_cid * 100 + i, "title": f"Playlist {i}", "youtube_playlist": f"https://youtube.com/playlist?list=MOCK{cv_cid}{i}"} for i in range(3)]
+        elif path == "/get/item/assignment":
+            itemid = int(params.get("item_id", 0) or 0)
+            data = {**self.items(itemid // 10_000 or 1, "assignment")[0], "itemid": itemid}
+        elif path == "/get/course/roster":
+            data = [
+                {
+                    "uid": 100_000 + i,
+                    "student_id": f"65{cv_cid:03d}{i:05d}",
+                    "firstname_en": f"Student{i}",
+                    "lastname_en": "Mock",
+                    "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+                    "year": 1 + i % 4,
+                    "section": 1 + i % 3,
+                    "role": "student",
+                }
+                for i in range(self.args.roster)
+            ]
+        elif path == "/get/user/gradeletter":
+            data = {"cv_cid": cv_cid, "grade": "ABCDF"[cv_cid % 5], "credit": 3}
+        else:
+            return JSONResponse({"status": "error", "message": "not found"}, status_code=404)
+        return JSONResponse({"status": "success", "data": data})
+
+    async def stats(self, request: Request) -> JSONResponse:
+        return JSONResponse({"total": sum(self.calls.values()), "by_path": dict(self.calls)})
+
+    async def reset(self, request: Request) -> JSONResponse:
+        self.calls.clear()
+        return JSONResponse({"total": 0, "by_path": {}})
+
+    def app(self) -> Starlette:
+        return Starlette(
+            routes=[
+                Route("/stats", self.stats, methods=["GET"]),
+                Route("/stats/reset", self.reset, methods=["POST"]),
+                Route(API + "/{path:path}", self.handle, methods=["GET"]),
+            ]
+        )
+
+
+class _MockError(Exception):
+    pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local MyCourseVille stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=50, help="mean response latency in ms")
+    parser.add_argument("--jitter", type=float, default=20, help="uniform latency jitter in ms")
+    parser.add_argument("--courses", type=int, default=6, help="courses per user")
+    parser.add_argument("--items", type=int, default=20, help="items per course list endpoint")
+    parser.add_argument("--roster", type=int, default=200, help="students per roster")
+    parser.add_argument("--text-size", type=int, default=600, help="approximate bytes of HTML per description")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    uvicorn.run(MockMCV(args).app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Admission control and per-user fair scheduling for tool calls.
+
+Every tool call needs one of ``max_concurrent`` execution slots, and a user
+holds at most ``user_concurrency`` of them at a time, so one agent firing
+dozens of parallel calls cannot crowd out everyone else. Calls that cannot
+start right away wait in a bounded queue. When a slot frees up, the waiting
+call with the smallest virtual start time goes next (weighted fair queuing):
+each call adds its tool's cost to its user's virtual clock, so users are
+served in proportion to the work they ask for, not the number of calls they
+queue. A call is rejected right away with a "busy" error when the queue, or
+the user's share of it, is full, and also if it waits longer than
+``queue_timeout``. This is better than letting the client time out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from cache.response import user_key
+from config.contants import (
+    ADMISSION_MAX_CONCURRENT,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT,
+    ADMISSION_TOOL_COSTS,
+    ADMISSION_USER_CONCURRENCY,
+    ADMISSION_USER_QUEUE,
+)
+from metrics.registry import REGISTRY
+
+ADMISSION_WAIT = REGISTRY.histogram(
+    "mcp_admission_wait_seconds", "Time tool calls waited for an execution slot.", ("tool",)
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "mcp_admission_rejected_total", "Tool calls shed by admission control.", ("reason",)
+)
+
+# Relative cost of a call, per tool; tools not listed cost 1. Aggregate tools
+# fan out to every course, rosters are the largest single payloads.
+DEFAULT_TOOL_COSTS: dict[str, float] = {
+    "get_all_assignments": 4,
+    "get_all_announcements": 4,
+    "get_all_materials": 4,
+    "get_all_online_meetings": 4,
+    "get_all_gradeletters": 4,
+    "run_query": 4,
+    "get_student_roster": 2,
+    "get_roster_summary": 2,
+    "get_roster_changes": 2,
+}
+
+
+class Busy(ToolError):
+    """The call was shed; the client should retry later."""
+
+
+@dataclass
+class _Waiter:
+    tag: float
+    seq: int
+    cost: float
+    future: asyncio.Future
+
+
+@dataclass
+class _User:
+    running: int = 0
+    finish: float = 0.0
+    queue: deque[_Waiter] = field(default_factory=deque)
+
+
+class AdmissionController(Middleware):
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = 64,
+        user_concurrency: int = 4,
+        max_queue: int = 256,
+        user_queue: int = 32,
+        queue_timeout: float = 15,
+        tool_costs: dict[str, float] | None = None,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.user_concurrency = max(1, user_concurrency)
+        self.max_queue = max_queue
+        self.user_queue = user_queue
+        self.queue_timeout = queue_timeout
+        self.tool_costs = {**DEFAULT_TOOL_COSTS, **(tool_costs or {})}
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._vtime = 0.0
+        self._seq = itertools.count()
+        self._users: dict[str, _User] = {}
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        token = get_access_token()
+        user_id = user_key(token) if token is not None else "anonymous"
+        tool = context.message.name
+        start = time.perf_counter()
+        await self.acquire(user_id, self.tool_costs.get(tool, 1))
+        ADMISSION_WAIT.observe(time.perf_counter() - start, tool=tool)
+        try:
+            return await call_next(context)
+        finally:
+            self.release(user_id)
+
+    def _reject(self, reason: str, message: str) -> Busy:
+        self.rejected += 1
+        ADMISSION_REJECTED.inc(reason=reason)
+        return Busy(message)
+
+    async def acquire(self, user_id: str, cost: float = 1) -> None:
+        user = self._users.setdefault(user_id, _User())
+        # Start-time fair queuing: a call's tag is when its user's earlier
+        # calls "finish" in virtual time; an idle user starts at the current
+        # virtual time instead of with banked credit.
+        tag = max(self._vtime, user.finish)
+        if (
+            self.running < self.max_concurrent
+            and user.running < self.user_concurrency
+            and not user.queue
+        ):
+            user.finish = tag + cost
+            self._vtime = tag
+            self._start(user)
+            return
+
+        if self.queued >= self.max_queue:
+            self._forget(user_id)
+            raise self._reject("queue_full", "Server is busy, retry in a few seconds")
+        if len(user.queue) >= self.user_queue:
+            raise self._reject(
+                "user_queue_full",
+                f"Too many tool calls in progress for this user ({self.user_concurrency} run "
+                f"at a time, {self.user_queue} may wait); retry after some finish",
+            )
+
+        user.finish = tag + cost
+        waiter = _Waiter(tag, next(self._seq), cost, asyncio.get_running_loop().create_future())
+        user.queue.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done():
+                # Granted while timing out or being cancelled: give the slot back.
+                self.release(user_id)
+            else:
+                waiter.future.cancel()
+                self._shed(user, waiter)
+                self._forget(user_id)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject(
+                "timeout", f"Server is busy, no slot within {self.queue_timeout:g}s; retry later"
+            ) from None
+
+    def _shed(self, user: _User, waiter: _Waiter) -> None:
+        """Drop a waiter that never ran and take its cost back off the user's clock."""
+        index = user.queue.index(waiter)
+        del user.queue[index]
+        self.queued -= 1
+        for later in itertools.islice(user.queue, index, None):
+            later.tag -= waiter.cost
+        user.finish -= waiter.cost
+
+    def release(self, user_id: str) -> None:
+        user = self._users[user_id]
+        user.running -= 1
+        self.running -= 1
+        self._dispatch()
+        self._forget(user_id)
+
+    def _start(self, user: _User) -> None:
+        user.running += 1
+        self.running += 1
+        self.admitted += 1
+
+    def _dispatch(self) -> None:
+        while self.running < self.max_concurrent and self.queued:
+            ready = [
+                u for u in self._users.values() if u.queue and u.running < self.user_concurrency
+            ]
+            if not ready:
+                return
+            user = min(ready, key=lambda u: (u.queue[0].tag, u.queue[0].seq))
+            waiter = user.queue.popleft()
+            self.queued -= 1
+            self._vtime = max(self._vtime, waiter.tag)
+            self._start(user)
+            waiter.future.set_result(None)
+
+    def _forget(self, user_id: str) -> None:
+        user = self._users.get(user_id)
+        if user is not None and not user.running and not user.queue:
+            del self._users[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "users": len(self._users),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+admission = AdmissionController(
+    max_concurrent=ADMISSION_MAX_CONCURRENT,
+    user_concurrency=ADMISSION_USER_CONCURRENCY,
+    max_queue=ADMISSION_MAX_QUEUE,
+    user_queue=ADMISSION_USER_QUEUE,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    tool_costs=ADMISSION_TOOL_COSTS,
+)
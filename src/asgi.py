@@ -0,0 +1,16 @@
+"""ASGI app for production serving, imported by every uvicorn worker.
+
+    uvicorn asgi:app --app-dir src --workers 4 --timeout-graceful-shutdown 30
+
+``python src/server.py`` does the same when ``WORKERS`` > 1, and also lets
+in-flight tool calls finish their SSE responses on SIGTERM (see ``drain``).
+Under the CLI, keep ``--timeout-graceful-shutdown`` at least
+``GRACEFUL_TIMEOUT``: the lifespan makes each worker wait that long for
+in-flight tool calls.
+"""
+
+from config.contants import STATELESS_HTTP
+from server import mcp
+from transport import http_middleware
+
+app = mcp.http_app(stateless_http=STATELESS_HTTP, middleware=http_middleware())
@@ -21,6 +21,9 @@ Example:
 
 from __future__ import annotations
 
+import time
+from typing import Callable
+
 import httpx
 from fastmcp.server.auth import TokenVerifier
 from fastmcp.server.auth.auth import AccessToken
@@ -33,8 +36,19 @@ from key_value.aio.protocols import AsyncKeyValue
 from pydantic import AnyHttpUrl, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from auth.token_cache import TokenCache
+from clients import mcv
+from clients.resilience import UpstreamBudgetExceeded, UpstreamUnavailable
+from metrics.registry import REGISTRY
+
 logger = get_logger(__name__)
 
+TOKEN_VERIFICATION = REGISTRY.histogram(
+    "mcv_token_verification_seconds",
+    "Time to verify a bearer token, by outcome.",
+    ("result",),
+)
+
 
 class mcvProviderSettings(BaseSettings):
     """Settings for mcv OAuth provider."""
@@ -54,6 +68,9 @@ class mcvProviderSettings(BaseSettings):
     timeout_seconds: int | None = None
     allowed_client_redirect_uris: list[str] | None = None
     jwt_signing_key: str | None = None
+    token_cache_ttl_seconds: float | None = None
+    token_cache_negative_ttl_seconds: float | None = None
+    token_cache_max_size: int | None = None
 
     @field_validator("required_scopes", mode="before")
     @classmethod
@@ -69,57 +86,92 @@ class MCVTokenVerifier(TokenVerifier):
         *,
         required_scopes: list[str] | None = None,
         timeout_seconds: int = 10,
+        cache: TokenCache | None = None,
     ):
         super().__init__(required_scopes=required_scopes)
         self.timeout_seconds = timeout_seconds
+        self.cache = cache
+        # Called with every successfully verified token, e.g. to warm caches.
+        self.on_verified: list[Callable[[AccessToken], None]] = []
 
     async def verify_token(self, token: str) -> AccessToken | None:
-        """Verify MyCourseVille OAuth token by calling the /users/me endpoint."""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                logger.debug("Verifying MyCourseVille token")
-
-                response = await client.get(
-                    "https://www.mycourseville.com/api/v1/public/users/me",
-                    headers={"Authorization": f"Bearer {token}"},
-                )
+        """Verify MyCourseVille OAuth token by calling the /users/me endpoint.
 
-                if response.status_code != 200:
-                    logger.debug(
-                        "MyCourseVille token verification failed: %d",
-                        response.status_code,
-                    )
-                    return None
-
-                token_info = response.json()
-                user = token_info.get("user", {})
-
-                # Construct AccessToken directly from JSON
-                access_token = AccessToken(
-                    token=token,
-                    client_id="mycourseville",
-                    scopes=[],
-                    expires_at=None,
-                    claims={
-                        "id": user.get("id"),
-                        "firstname_en": user.get("firstname_en"),
-                        "lastname_en": user.get("lastname_en"),
-                        "firstname_th": user.get("firstname_th"),
-                        "lastname_th": user.get("lastname_th"),
-                        "provider": "MyCourseVille",
-                    },
+        Results are served from ``cache`` when one is configured.
+        """
+        start = time.perf_counter()
+        access_token = await self._verify(token)
+        TOKEN_VERIFICATION.observe(
+            time.perf_counter() - start,
+            result="valid" if access_token is not None else "invalid",
+        )
+        if access_token is not None:
+            for callback in self.on_verified:
+                try:
+                    callback(access_token)
+                except Exception as e:
+                    logger.warning("Token verification callback %r failed: %s", callback, e)
+        return access_token
+
+    async def _verify(self, token: str) -> AccessToken | None:
+        try:
+            if self.cache is not None:
+                claims = await self.cache.get_or_verify(
+                    token, lambda: self._fetch_claims(token)
                 )
+            else:
+                claims = await self._fetch_claims(token)
+
+            if claims is None:
+                return None
+
+            # Construct AccessToken directly from JSON
+            return AccessToken(
+                token=token,
+                client_id="mycourseville",
+                scopes=[],
+                expires_at=None,
+                claims=claims,
+            )
 
-                logger.debug("MyCourseVille token verified successfully")
-                return access_token
-
-        except httpx.RequestError as e:
+        except (httpx.RequestError, UpstreamUnavailable, UpstreamBudgetExceeded) as e:
             logger.debug("Failed to verify MyCourseVille token: %s", e)
             return None
         except Exception as e:
             logger.debug("MyCourseVille token verification error: %s", e)
             return None
 
+    async def _fetch_claims(self, token: str) -> dict | None:
+        """Fetch user claims from /users/me.
+
+        Returns ``None`` when MyCourseVille rejects the token; transient
+        failures raise so they are never cached as a rejection.
+        """
+        logger.debug("Verifying MyCourseVille token")
+
+        response = await mcv.send("/users/me", token, timeout=self.timeout_seconds)
+
+        if response.status_code in (400, 401, 403):
+            logger.debug(
+                "MyCourseVille token verification failed: %d",
+                response.status_code,
+            )
+            return None
+        response.raise_for_status()
+
+        token_info = response.json()
+        user = token_info.get("user", {})
+
+        logger.debug("MyCourseVille token verified successfully")
+        return {
+            "id": user.get("id"),
+            "firstname_en": user.get("firstname_en"),
+            "lastname_en": user.get("lastname_en"),
+            "firstname_th": user.get("firstname_th"),
+            "lastname_th": user.get("lastname_th"),
+            "provider": "MyCourseVille",
+        }
+
 
 class MCVProvider(OAuthProxy):
     """Complete mcv OAuth provider for FastMCP.
@@ -163,6 +215,9 @@ class MCVProvider(OAuthProxy):
         client_storage: AsyncKeyValue | None = None,
         jwt_signing_key: str | bytes | NotSetT = NotSet,
         require_authorization_consent: bool = True,
+        token_cache_ttl_seconds: float | NotSetT = NotSet,
+        token_cache_negative_ttl_seconds: float | NotSetT = NotSet,
+        token_cache_max_size: int | NotSetT = NotSet,
     ):
         """Initialize mcv OAuth provider.
 
@@ -187,6 +242,11 @@ class MCVProvider(OAuthProxy):
                 When True, users see a consent screen before being redirected to mcv.
                 When False, authorization proceeds directly without user confirmation.
                 SECURITY WARNING: Only disable for local development or testing environments.
+            token_cache_ttl_seconds: How long a verified token is trusted before /users/me is called
+                again (default 300). Set to 0 to disable the verification cache.
+            token_cache_negative_ttl_seconds: How long a rejected token stays rejected (default 30).
+            token_cache_max_size: Maximum number of tokens kept in the in-process cache (default 10000).
+                When client_storage is given, verification results are also shared through it.
         """
 
         settings = mcvProviderSettings.model_validate(
@@ -202,6 +262,9 @@ class MCVProvider(OAuthProxy):
                     "timeout_seconds": timeout_seconds,
                     "allowed_client_redirect_uris": allowed_client_redirect_uris,
                     "jwt_signing_key": jwt_signing_key,
+                    "token_cache_ttl_seconds": token_cache_ttl_seconds,
+                    "token_cache_negative_ttl_seconds": token_cache_negative_ttl_seconds,
+                    "token_cache_max_size": token_cache_max_size,
                 }.items()
                 if v is not NotSet
             }
@@ -222,9 +285,28 @@ class MCVProvider(OAuthProxy):
 
         allowed_client_redirect_uris_final = settings.allowed_client_redirect_uris
 
+        token_cache_ttl_final = (
+            settings.token_cache_ttl_seconds
+            if settings.token_cache_ttl_seconds is not None
+            else 300
+        )
+        token_cache = None
+        if token_cache_ttl_final > 0:
+            token_cache = TokenCache(
+                maxsize=settings.token_cache_max_size or 10_000,
+                ttl=token_cache_ttl_final,
+                negative_ttl=(
+                    settings.token_cache_negative_ttl_seconds
+                    if settings.token_cache_negative_ttl_seconds is not None
+                    else 30
+                ),
+                storage=client_storage,
+            )
+
         # Create mcv token verifier
         token_verifier = MCVTokenVerifier(
             timeout_seconds=timeout_seconds_final,
+            cache=token_cache,
         )
 
         # Extract secret string from SecretStr
@@ -237,8 +319,8 @@ class MCVProvider(OAuthProxy):
         valid_scopes_final = settings.required_scopes or []
 
         super().__init__(
-            upstream_authorization_endpoint="https://www.mycourseville.com/api/oauth/authorize",
-            upstream_token_endpoint="https://www.mycourseville.com/api/oauth/access_token",
+            upstream_authorization_endpoint=f"{mcv.MCV_BASE_URL}/api/oauth/authorize",
+            upstream_token_endpoint=f"{mcv.MCV_BASE_URL}/api/oauth/access_token",
             upstream_client_id=settings.client_id,
             upstream_client_secret=client_secret_str,
             valid_scopes=valid_scopes_final,
@@ -253,6 +335,9 @@ class MCVProvider(OAuthProxy):
             require_authorization_consent=require_authorization_consent,
         )
 
+        self.token_cache = token_cache
+        self.token_verifier = token_verifier
+
         logger.debug(
             "Initialized mcv OAuth provider for client %s with scopes: %s",
             settings.client_id,
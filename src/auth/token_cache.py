@@ -0,0 +1,116 @@
+"""Verification cache for MyCourseVille bearer tokens.
+
+Keeps the claims returned by ``/users/me`` so authenticated requests do not
+call MyCourseVille every time. Entries are keyed by a SHA-256 of the token so
+raw tokens are never held as cache keys. An optional ``AsyncKeyValue`` store
+(e.g. the provider's ``client_storage``) lets several instances share results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastmcp.utilities.logging import get_logger
+from key_value.aio.protocols import AsyncKeyValue
+
+from cache.memory import TTLCache
+from cache.singleflight import SingleFlight
+
+logger = get_logger(__name__)
+
+TOKEN_CACHE_COLLECTION = "mcv-token-verification"
+
+
+class TokenCache:
+    """LRU + TTL cache of token verification results.
+
+    Valid tokens are cached for ``ttl`` seconds, rejected tokens for the
+    shorter ``negative_ttl``. Concurrent lookups for the same token share a
+    single upstream verification.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 10_000,
+        ttl: float = 300,
+        negative_ttl: float = 30,
+        storage: AsyncKeyValue | None = None,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.storage = storage
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def get_or_verify(
+        self,
+        token: str,
+        verify: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> dict[str, Any] | None:
+        """Return cached claims for ``token`` or run ``verify`` to obtain them.
+
+        ``verify`` returns the claims for a valid token or ``None`` for a
+        rejected one; exceptions are propagated and never cached.
+        """
+        key = self.key(token)
+
+        entry = self._local.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry["claims"]
+
+        return await self._flight.do(key, lambda: self._load(key, verify))
+
+    async def _load(
+        self,
+        key: str,
+        verify: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> dict[str, Any] | None:
+        if self.storage is not None:
+            try:
+                entry, ttl = await self.storage.ttl(key, collection=TOKEN_CACHE_COLLECTION)
+            except Exception as e:
+                logger.debug("Token cache storage read failed: %s", e)
+                entry, ttl = None, None
+            if entry is not None:
+                self.hits += 1
+                self._local.set(key, entry, ttl=ttl or self.negative_ttl)
+                return entry["claims"]
+
+        self.misses += 1
+        claims = await verify()
+        entry = {"claims": claims}
+        ttl = self.ttl if claims is not None else self.negative_ttl
+        self._local.set(key, entry, ttl=ttl)
+
+        if self.storage is not None:
+            try:
+                await self.storage.put(
+                    key, entry, collection=TOKEN_CACHE_COLLECTION, ttl=ttl
+                )
+            except Exception as e:
+                logger.debug("Token cache storage write failed: %s", e)
+        return claims
+
+    async def invalidate(self, token: str) -> None:
+        key = self.key(token)
+        self._local.pop(key)
+        if self.storage is not None:
+            await self.storage.delete(key, collection=TOKEN_CACHE_COLLECTION)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+            "size": len(self._local),
+        }
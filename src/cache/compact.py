@@ -0,0 +1,118 @@
+"""Compact in-memory form of MyCourseVille JSON payloads.
+
+Decoded JSON is mostly lists of objects that share the same fields (courses,
+assignments, roster entries), and each object is a dict of its own. ``pack``
+stores such a list as one ``Records``: the field names once, as a shape tuple
+shared by every payload with the same fields, and a tuple of values per row.
+Strings and large integers go through a shared table, so the course codes,
+titles and descriptions cached for every student in a course are held once.
+``unpack`` rebuilds the original JSON shape with fresh containers, so callers
+can modify what they get without touching the cached copy.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+# Bounds of the shared value table. It is emptied when either is reached, so
+# values no cached entry uses any more are only kept alive for a while.
+MAX_SHARED_VALUES = 200_000
+MAX_SHARED_CHARS = 8_000_000
+MAX_SHAPES = 4096
+
+_shapes: dict[tuple[str, ...], tuple[str, ...]] = {}
+_shared: dict[str | int, str | int] = {}
+_shared_chars = 0
+
+
+class Record:
+    """A JSON object: a shared shape and one value per field."""
+
+    __slots__ = ("keys", "values", "nested")
+
+    def __init__(self, keys: tuple[str, ...], values: tuple, nested: bool):
+        self.keys = keys
+        self.values = values
+        self.nested = nested
+
+
+class Records:
+    """A JSON array of objects that all have the same fields, in order."""
+
+    __slots__ = ("keys", "rows", "nested")
+
+    def __init__(self, keys: tuple[str, ...], rows: tuple[tuple, ...], nested: bool):
+        self.keys = keys
+        self.rows = rows
+        self.nested = nested
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+_CONTAINERS = (Record, Records, list)
+
+
+def _shape(keys: tuple[str, ...]) -> tuple[str, ...]:
+    shape = _shapes.get(keys)
+    if shape is None:
+        shape = tuple(sys.intern(key) for key in keys)
+        if len(_shapes) < MAX_SHAPES:
+            _shapes[shape] = shape
+    return shape
+
+
+def _share(value: str | int) -> str | int:
+    global _shared_chars
+    shared = _shared.get(value)
+    if shared is not None:
+        return shared
+    if len(_shared) >= MAX_SHARED_VALUES or _shared_chars >= MAX_SHARED_CHARS:
+        _shared.clear()
+        _shared_chars = 0
+    _shared[value] = value
+    if type(value) is str:
+        _shared_chars += len(value)
+    return value
+
+
+def pack(value: Any) -> Any:
+    """Compact form of a decoded JSON value; see ``unpack``."""
+    cls = type(value)
+    if cls is str:
+        return _share(value)
+    if cls is int:
+        # CPython already shares -5..256
+        return value if -5 <= value <= 256 else _share(value)
+    if cls is dict:
+        values = tuple(pack(v) for v in value.values())
+        return Record(
+            _shape(tuple(value)), values, any(isinstance(v, _CONTAINERS) for v in values)
+        )
+    if cls is list:
+        if value and all(type(item) is dict for item in value):
+            keys = tuple(value[0])
+            if all(len(item) == len(keys) and tuple(item) == keys for item in value):
+                rows = tuple(tuple(pack(v) for v in item.values()) for item in value)
+                nested = any(isinstance(v, _CONTAINERS) for row in rows for v in row)
+                return Records(_shape(keys), rows, nested)
+        return [pack(item) for item in value]
+    return value
+
+
+def unpack(value: Any) -> Any:
+    """The JSON value ``pack`` was given, rebuilt from its compact form."""
+    cls = type(value)
+    if cls is Records:
+        keys = value.keys
+        if value.nested:
+            return [{k: unpack(v) for k, v in zip(keys, row)} for row in value.rows]
+        return [dict(zip(keys, row)) for row in value.rows]
+    if cls is Record:
+        if value.nested:
+            return {k: unpack(v) for k, v in zip(value.keys, value.values)}
+        return dict(zip(value.keys, value.values))
+    if cls is list:
+        return [unpack(item) for item in value]
+    return value
@@ -0,0 +1,217 @@
+"""Per-user cache for MyCourseVille read endpoints.
+
+Responses are keyed on (user id, endpoint, params) and served fresh for a
+per-endpoint TTL. After that they are still returned for ``stale_ttl`` seconds
+while a background task revalidates them (stale-while-revalidate), so agents
+asking the same question twice in a conversation never wait on MyCourseVille.
+In process memory, responses are held in the compact form of ``cache.compact``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastmcp.server.auth.auth import AccessToken
+from fastmcp.utilities.logging import get_logger
+from key_value.aio.protocols import AsyncKeyValue
+
+from cache.compact import pack, unpack
+from cache.memory import TTLCache
+from cache.singleflight import SingleFlight
+from clients import mcv
+from config.contants import (
+    RESPONSE_CACHE_COMPACT,
+    RESPONSE_CACHE_DEFAULT_TTL,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_SIZE,
+    RESPONSE_CACHE_STALE_TTL,
+    RESPONSE_CACHE_TTLS,
+)
+
+logger = get_logger(__name__)
+
+RESPONSE_CACHE_COLLECTION = "mcv-responses"
+
+# Seconds a response is considered fresh, per MyCourseVille endpoint.
+DEFAULT_TTLS: dict[str, float] = {
+    "/get/user/courses": 3600,
+    "/get/course/info": 3600,
+    "/get/course/playlists": 1800,
+    "/get/course/materials": 600,
+    "/get/course/onlinemeetings": 600,
+    "/get/course/assignments": 300,
+    "/get/course/announcements": 300,
+    "/get/course/roster": 1800,
+    # Grades are released once per term
+    "/get/user/gradeletter": 21600,
+}
+
+
+class ResponseCache:
+    """Stale-while-revalidate cache for upstream responses.
+
+    Entries live in a size-bounded in-process LRU, or in ``storage`` when an
+    ``AsyncKeyValue`` store is given so several workers share them.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 5000,
+        default_ttl: float = 300,
+        stale_ttl: float = 600,
+        ttls: dict[str, float] | None = None,
+        storage: AsyncKeyValue | None = None,
+        compact: bool = True,
+    ):
+        self.compact = compact
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.storage = storage
+        self._local = TTLCache(maxsize=maxsize, ttl=default_ttl + stale_ttl)
+        self._flight = SingleFlight()
+        self._background: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    @staticmethod
+    def key(user_id: str, endpoint: str, params: dict | None) -> str:
+        raw = json.dumps([user_id, endpoint, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get_or_fetch(
+        self,
+        user_id: str,
+        endpoint: str,
+        params: dict | None,
+        loader: Callable[[], Awaitable[Any]],
+        *,
+        refresh: bool = False,
+    ) -> Any:
+        """Return the cached response or call ``loader``.
+
+        ``refresh=True`` skips the cached copy and stores the new response.
+        """
+        key = self.key(user_id, endpoint, params)
+        ttl = self.ttl_for(endpoint)
+
+        if not refresh:
+            entry = await self._read(key)
+            if entry is not None:
+                age = time.time() - entry["fetched_at"]
+                if age < ttl:
+                    self.hits += 1
+                    return entry["value"]
+                if age < ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    self._revalidate(key, ttl, loader)
+                    return entry["value"]
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._load(key, ttl, loader))
+
+    def _revalidate(
+        self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]
+    ) -> None:
+        if self._flight.in_flight(key):
+            return
+        task = asyncio.ensure_future(
+            self._flight.do(key, lambda: self._load(key, ttl, loader))
+        )
+        self._background.add(task)
+        task.add_done_callback(self._revalidated)
+
+    def _revalidated(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Background revalidation failed: %s", task.exception())
+
+    async def _load(
+        self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = await loader()
+        entry = {"value": value, "fetched_at": time.time()}
+        await self._write(key, entry, ttl + self.stale_ttl)
+        return value
+
+    async def _read(self, key: str) -> dict[str, Any] | None:
+        if self.storage is None:
+            entry = self._local.get(key)
+            if entry is not None and self.compact:
+                entry = {**entry, "value": unpack(entry["value"])}
+            return entry
+        try:
+            return await self.storage.get(key, collection=RESPONSE_CACHE_COLLECTION)
+        except Exception as e:
+            logger.debug("Response cache storage read failed: %s", e)
+            return None
+
+    async def _write(self, key: str, entry: dict[str, Any], ttl: float) -> None:
+        if self.storage is None:
+            if self.compact:
+                entry = {**entry, "value": pack(entry["value"])}
+            self._local.set(key, entry, ttl=ttl)
+            return
+        try:
+            await self.storage.put(
+                key, entry, collection=RESPONSE_CACHE_COLLECTION, ttl=ttl
+            )
+        except Exception as e:
+            logger.debug("Response cache storage write failed: %s", e)
+
+    def stats(self) -> dict[str, int]:
+        stats = {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+        # Entries in shared storage can't be counted from here.
+        if self.storage is None:
+            stats["size"] = len(self._local)
+        return stats
+
+
+response_cache = ResponseCache(
+    maxsize=RESPONSE_CACHE_MAX_SIZE,
+    default_ttl=RESPONSE_CACHE_DEFAULT_TTL,
+    stale_ttl=RESPONSE_CACHE_STALE_TTL,
+    ttls=RESPONSE_CACHE_TTLS,
+    compact=RESPONSE_CACHE_COMPACT,
+)
+
+
+def user_key(token: AccessToken) -> str:
+    """Identify the cache owner: the MyCourseVille user id, else a token hash."""
+    user_id = (token.claims or {}).get("id")
+    if user_id is not None:
+        return str(user_id)
+    return hashlib.sha256(token.token.encode()).hexdigest()
+
+
+async def fetch_cached(
+    token: AccessToken,
+    path: str,
+    params: dict | None = None,
+    *,
+    refresh: bool = False,
+):
+    """``mcv.fetch`` through the per-user response cache."""
+    if not RESPONSE_CACHE_ENABLED:
+        return await mcv.fetch(path, token.token, params)
+    return await response_cache.get_or_fetch(
+        user_key(token),
+        path,
+        params,
+        lambda: mcv.fetch(path, token.token, params),
+        refresh=refresh,
+    )
@@ -0,0 +1,147 @@
+"""Prefetch a user's course data into the response cache after login.
+
+When a token is verified for a user not warmed up within ``WARMUP_COOLDOWN``,
+a background task fetches the course list and then ``WARMUP_ENDPOINTS`` for
+the user's most recent courses, so the first tool calls are cache hits. The
+task never makes more than ``WARMUP_MAX_REQUESTS`` upstream requests (entries
+already cached cost nothing) or runs more than ``WARMUP_CONCURRENCY`` at once,
+and its requests count against the user's own rate limit like any other call.
+A tool call that needs a response being prefetched joins the in-flight
+request instead of issuing another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastmcp.server.auth.auth import AccessToken
+from fastmcp.utilities.logging import get_logger
+
+from cache.memory import TTLCache
+from cache.response import response_cache, user_key
+from clients import mcv
+from config.contants import (
+    RESPONSE_CACHE_ENABLED,
+    WARMUP_CONCURRENCY,
+    WARMUP_COOLDOWN,
+    WARMUP_ENABLED,
+    WARMUP_ENDPOINTS,
+    WARMUP_MAX_COURSES,
+    WARMUP_MAX_REQUESTS,
+)
+from utils.payload import records
+
+logger = get_logger(__name__)
+
+# Params the controllers use for each endpoint; they must match to share cache entries.
+COURSE_PARAMS = {
+    "/get/course/info": {},
+    "/get/course/playlists": {},
+    "/get/course/onlinemeetings": {},
+    "/get/course/assignments": {"detail": 1, "published": 1},
+    "/get/course/announcements": {"detail": 1, "published": 1},
+    "/get/course/materials": {"detail": 1, "published": 1},
+}
+
+
+class _BudgetSpent(Exception):
+    """The warm-up has made its ``max_requests`` upstream requests."""
+
+
+class Warmup:
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        endpoints: list[str] | None = None,
+        concurrency: int = 2,
+        max_requests: int = 12,
+        max_courses: int = 8,
+        cooldown: float = 3600,
+    ):
+        self.enabled = enabled
+        self.endpoints = [e for e in (endpoints or []) if e in COURSE_PARAMS]
+        self.concurrency = concurrency
+        self.max_requests = max_requests
+        self.max_courses = max_courses
+        self._recent = TTLCache(maxsize=50_000, ttl=cooldown)
+        self._tasks: set[asyncio.Task] = set()
+        self.started = 0
+        self.requests = 0
+
+    def attach(self, auth) -> None:
+        """Run on every token verified by ``auth`` (an MCVTokenVerifier or MCVProvider)."""
+        verifier = getattr(auth, "token_verifier", auth)
+        verifier.on_verified.append(self.schedule)
+
+    def schedule(self, token: AccessToken) -> None:
+        if not self.enabled or not RESPONSE_CACHE_ENABLED:
+            return
+        key = user_key(token)
+        if key in self._recent:
+            return
+        self._recent.set(key, True)
+        self.started += 1
+        task = asyncio.ensure_future(self.run(token))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def run(self, token: AccessToken) -> int:
+        """Prefetch for one user; returns the number of upstream requests made."""
+        budget = self.max_requests
+        made = 0
+
+        async def fetch(path: str, params: dict):
+            async def load():
+                # Only lookups that reach MyCourseVille spend the budget.
+                nonlocal budget, made
+                if budget <= 0:
+                    raise _BudgetSpent
+                budget -= 1
+                made += 1
+                self.requests += 1
+                return await mcv.fetch(path, token.token, params)
+
+            return await response_cache.get_or_fetch(user_key(token), path, params, load)
+
+        try:
+            payload = await fetch("/get/user/courses", {"detail": 1})
+        except Exception as e:
+            logger.debug("Warm-up course list failed: %s", e)
+            return made
+
+        courses = [c for c in records(payload) if isinstance(c, dict) and c.get("cv_cid") is not None]
+        # Current term first: it is what users ask about right after logging in
+        courses.sort(key=lambda c: (str(c.get("year") or ""), str(c.get("semester") or "")), reverse=True)
+        jobs = [
+            (path, {"cv_cid": str(course["cv_cid"]), **COURSE_PARAMS[path]})
+            for course in courses[: self.max_courses]
+            for path in self.endpoints
+        ]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def prefetch(path: str, params: dict) -> None:
+            async with semaphore:
+                try:
+                    await fetch(path, params)
+                except _BudgetSpent:
+                    pass
+                except Exception as e:
+                    logger.debug("Warm-up of %s failed: %s", path, e)
+
+        await asyncio.gather(*(prefetch(path, params) for path, params in jobs))
+        return made
+
+    def stats(self) -> dict:
+        return {"started": self.started, "requests": self.requests, "running": len(self._tasks)}
+
+
+warmup = Warmup(
+    enabled=WARMUP_ENABLED,
+    endpoints=WARMUP_ENDPOINTS,
+    concurrency=WARMUP_CONCURRENCY,
+    max_requests=WARMUP_MAX_REQUESTS,
+    max_courses=WARMUP_MAX_COURSES,
+    cooldown=WARMUP_COOLDOWN,
+)
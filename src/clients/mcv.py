@@ -0,0 +1,191 @@
+"""Shared HTTP client for MyCourseVille API calls.
+
+Every controller and the token verifier reuse one pooled ``httpx.AsyncClient``
+so connections to MyCourseVille (``MCV_BASE_URL``) stay alive between tool
+calls instead of paying a new TCP+TLS handshake each time. The client is
+created lazily and closed by the server lifespan on shutdown.
+
+Identical GETs issued concurrently for the same token share one upstream
+request, and every request goes through the rate limiting, retry and circuit
+breaker policy in ``clients.resilience``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+from fastmcp import FastMCP
+from fastmcp.utilities.logging import get_logger
+
+from cache.singleflight import SingleFlight
+from clients.resilience import CircuitBreaker, RateLimiter, UpstreamPolicy
+from config.contants import (
+    MCV_BREAKER_FAILURES,
+    MCV_BASE_URL,
+    MCV_BREAKER_RESET,
+    MCV_COALESCE_REQUESTS,
+    MCV_CONNECT_TIMEOUT,
+    MCV_HTTP2,
+    MCV_KEEPALIVE_EXPIRY,
+    MCV_MAX_CONNECTIONS,
+    MCV_MAX_KEEPALIVE_CONNECTIONS,
+    MCV_RATE_BURST,
+    MCV_RATE_LIMIT,
+    MCV_RETRY_ATTEMPTS,
+    MCV_RETRY_BASE_DELAY,
+    MCV_RETRY_MAX_DELAY,
+    MCV_TIMEOUT,
+    MCV_TIMEOUT_BUDGET,
+    MCV_TIMEOUT_BUDGETS,
+    MCV_USER_RATE_BURST,
+    MCV_USER_RATE_LIMIT,
+)
+from metrics.registry import REGISTRY, record_upstream_time
+from utils.fastjson import loads
+
+logger = get_logger(__name__)
+
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "mcv_upstream_request_seconds", "MyCourseVille request latency.", ("path",)
+)
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    "mcv_upstream_responses_total",
+    "MyCourseVille responses by path and status code.",
+    ("path", "status"),
+)
+
+MCV_API_URL = f"{MCV_BASE_URL}/api/v1/public"
+
+_client: httpx.AsyncClient | None = None
+_flight = SingleFlight()
+_requests = 0
+
+policy = UpstreamPolicy(
+    limiter=RateLimiter(
+        MCV_RATE_LIMIT, MCV_RATE_BURST, MCV_USER_RATE_LIMIT, MCV_USER_RATE_BURST
+    ),
+    breaker=CircuitBreaker(MCV_BREAKER_FAILURES, MCV_BREAKER_RESET),
+    attempts=MCV_RETRY_ATTEMPTS,
+    base_delay=MCV_RETRY_BASE_DELAY,
+    max_delay=MCV_RETRY_MAX_DELAY,
+    timeout=MCV_TIMEOUT,
+    budget=MCV_TIMEOUT_BUDGET,
+    budgets=MCV_TIMEOUT_BUDGETS,
+)
+
+
+def _http2_enabled() -> bool:
+    if not MCV_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("MCV_HTTP2 is enabled but h2 is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide MyCourseVille client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=_http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=MCV_MAX_CONNECTIONS,
+                max_keepalive_connections=MCV_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=MCV_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(MCV_TIMEOUT, connect=MCV_CONNECT_TIMEOUT),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """FastMCP lifespan that owns the shared client for the server's lifetime."""
+    get_client()
+    try:
+        yield {}
+    finally:
+        await close_client()
+
+
+async def fetch(path: str, access_token: str, params: dict | None = None):
+    """GET a MyCourseVille public API endpoint and return the decoded JSON.
+
+    Concurrent calls with the same token, path and params are coalesced into a
+    single upstream request whose result (or error) every caller receives.
+    """
+    if not MCV_COALESCE_REQUESTS:
+        return await _get(path, access_token, params)
+
+    key = (
+        _token_key(access_token),
+        path,
+        tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+    )
+    return await _flight.do(key, lambda: _get(path, access_token, params))
+
+
+async def send(
+    path: str,
+    access_token: str,
+    params: dict | None = None,
+    *,
+    timeout: float | None = None,
+) -> httpx.Response:
+    """Send one GET under the upstream policy and return the raw response."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    url = f"{MCV_API_URL}{path}"
+
+    async def attempt(attempt_timeout: float) -> httpx.Response:
+        global _requests
+        _requests += 1
+        start = time.perf_counter()
+        status = "error"
+        try:
+            resp = await get_client().get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=min(attempt_timeout, timeout or attempt_timeout),
+            )
+            status = str(resp.status_code)
+            return resp
+        finally:
+            elapsed = time.perf_counter() - start
+            UPSTREAM_DURATION.observe(elapsed, path=path)
+            UPSTREAM_RESPONSES.inc(path=path, status=status)
+            record_upstream_time(elapsed)
+
+    return await policy.run(path, _token_key(access_token), attempt)
+
+
+async def _get(path: str, access_token: str, params: dict | None):
+    resp = await send(path, access_token, params)
+    resp.raise_for_status()
+    return loads(resp.content)
+
+
+def _token_key(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def stats() -> dict:
+    """Upstream counters: requests sent, coalesced and in flight, plus policy state."""
+    return {
+        "requests": _requests,
+        "coalesced": _flight.coalesced,
+        "in_flight": len(_flight),
+        **policy.stats(),
+    }
@@ -0,0 +1,273 @@
+"""Rate limiting, retries and circuit breaking for MyCourseVille calls.
+
+``UpstreamPolicy.run`` wraps a single upstream request with:
+
+- a global and a per-user token bucket, which halve their rate when
+  MyCourseVille answers 429 and recover gradually afterwards;
+- retries with jittered exponential backoff that honor ``Retry-After``;
+- a circuit breaker that fails fast while MyCourseVille is down;
+- a total time budget per endpoint shared by all attempts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+from fastmcp.utilities.logging import get_logger
+
+from cache.memory import TTLCache
+
+logger = get_logger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class UpstreamUnavailable(Exception):
+    """MyCourseVille is failing and the circuit breaker is open."""
+
+
+class UpstreamBudgetExceeded(Exception):
+    """The call could not complete within its time budget."""
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to upstream throttling."""
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.min_rate = rate / 10
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self) -> None:
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def throttle(self) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def recover(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RateLimiter:
+    """A global bucket plus one bucket per user."""
+
+    def __init__(self, rate: float, burst: int, user_rate: float, user_burst: int):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.bucket = TokenBucket(rate, burst)
+        self._users = TTLCache(maxsize=10_000, ttl=600)
+
+    def _user(self, user: str) -> TokenBucket:
+        bucket = self._users.get(user)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst)
+        # Re-set on every use so only idle users' buckets expire; an active
+        # user must not get a fresh, full burst every TTL.
+        self._users.set(user, bucket)
+        return bucket
+
+    def reserve(self, user: str) -> float:
+        return max(self.bucket.reserve(), self._user(user).reserve())
+
+    def refund(self, user: str) -> None:
+        self.bucket.refund()
+        self._user(user).refund()
+
+    def throttle(self, user: str) -> None:
+        self.bucket.throttle()
+        self._user(user).throttle()
+
+    def recover(self, user: str) -> None:
+        self.bucket.recover()
+        self._user(user).recover()
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call fails immediately. After ``reset_timeout`` seconds
+    the circuit is half-open: one trial call is let through while the others
+    keep failing fast. The circuit closes once the trial succeeds, and opens
+    again if it fails.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def check(self) -> bool:
+        """Raise if the call may not go through; True if it is the half-open trial."""
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half-open" and not self.probing:
+            self.probing = True
+            return True
+        if state == "open":
+            retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise UpstreamUnavailable(
+                f"MyCourseVille is unavailable, retry in {retry_in:.0f}s"
+            )
+        raise UpstreamUnavailable("MyCourseVille is recovering, retry in a few seconds")
+
+    def end_probe(self) -> None:
+        """The trial call ended without a verdict (e.g. throttled); let the next one try."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.state == "half-open":
+                logger.warning("MyCourseVille circuit breaker opened")
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+
+def retry_after(resp: httpx.Response) -> float | None:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class UpstreamPolicy:
+    def __init__(
+        self,
+        *,
+        limiter: RateLimiter,
+        breaker: CircuitBreaker,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8,
+        timeout: float = 10,
+        budget: float = 20,
+        budgets: dict[str, float] | None = None,
+    ):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.budget = budget
+        self.budgets = budgets or {}
+        self.retries = 0
+        self.throttled = 0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def run(
+        self,
+        path: str,
+        user: str,
+        send: Callable[[float], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """Call ``send(timeout)`` under the policy and return its final response.
+
+        Retryable statuses are retried; if attempts run out the last response is
+        returned so the caller's ``raise_for_status`` reports it. Transport
+        errors are re-raised once attempts or the budget are exhausted.
+        """
+        deadline = time.monotonic() + self.budgets.get(path, self.budget)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self.breaker.check()
+            try:
+                wait = self.limiter.reserve(user)
+                if wait > 0:
+                    if time.monotonic() + wait >= deadline:
+                        self.limiter.refund(user)
+                        raise UpstreamBudgetExceeded(
+                            f"Rate limit for {path} would exceed the time budget"
+                        )
+                    await asyncio.sleep(wait)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise UpstreamBudgetExceeded(f"Time budget for {path} exhausted")
+
+                delay = None
+                try:
+                    resp = await send(min(self.timeout, remaining))
+                except httpx.TransportError as e:
+                    self.breaker.record_failure()
+                    if attempt >= self.attempts:
+                        raise
+                    logger.debug("MyCourseVille request to %s failed: %s", path, e)
+                else:
+                    if resp.status_code == 429:
+                        self.throttled += 1
+                        self.limiter.throttle(user)
+                        delay = retry_after(resp)
+                    elif resp.status_code in RETRY_STATUSES:
+                        self.breaker.record_failure()
+                        delay = retry_after(resp)
+                    else:
+                        self.breaker.record_success()
+                        self.limiter.recover(user)
+                        return resp
+                    if attempt >= self.attempts:
+                        return resp
+                    await resp.aclose()
+
+                delay = max(delay or 0.0, self.backoff(attempt))
+                if time.monotonic() + delay >= deadline:
+                    raise UpstreamBudgetExceeded(
+                        f"Retrying {path} would exceed the time budget"
+                    )
+                self.retries += 1
+                await asyncio.sleep(delay)
+            finally:
+                if probe:
+                    self.breaker.end_probe()
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "breaker_state": self.breaker.state,
+            "global_rate": self.limiter.bucket.rate,
+        }
@@ -4,11 +4,128 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+
+def _float_mapping(name: str) -> dict[str, float]:
+    """Parse "key=value,key=value" from the environment."""
+    return {
+        key.strip(): float(value)
+        for key, value in (
+            item.split("=", 1) for item in os.getenv(name, "").split(",") if "=" in item
+        )
+    }
+
+
 APP_NAME = os.getenv("APP_NAME", "mcv-mcp-server")
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", 8000))
 TRANSPORT = os.getenv("TRANSPORT", "http")
 
 MCV_CLIENT_ID     = os.getenv("MCV_CLIENT_ID", "default-client-id")
-MCV_CLIENT_SECRET = os.getenv("MCV_CLIENT_SECRET", "default-client-secret")
-MCV_REDIRECT_PATH  = os.getenv("MCV_REDIRECT_PATH", "/callback")
\ No newline at end of file
+# Fallback for local runs; storage refuses to derive its key from it
+PUBLIC_CLIENT_SECRET = "default-client-secret"
+MCV_CLIENT_SECRET = os.getenv("MCV_CLIENT_SECRET", PUBLIC_CLIENT_SECRET)
+MCV_REDIRECT_PATH  = os.getenv("MCV_REDIRECT_PATH", "/callback")
+# Point at a local stand-in (scripts/mock_mcv.py) for benchmarks
+MCV_BASE_URL = os.getenv("MCV_BASE_URL", "https://www.mycourseville.com").rstrip("/")
+# "oauth" proxies the MyCourseVille OAuth flow; "token" accepts MyCourseVille
+# access tokens directly as bearer tokens (load tests, pre-authorized clients)
+AUTH_MODE = os.getenv("AUTH_MODE", "oauth").lower()
+
+# Shared MyCourseVille HTTP client
+MCV_HTTP2 = os.getenv("MCV_HTTP2", "true").lower() == "true"
+MCV_MAX_CONNECTIONS = int(os.getenv("MCV_MAX_CONNECTIONS", 100))
+MCV_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("MCV_MAX_KEEPALIVE_CONNECTIONS", 20))
+MCV_KEEPALIVE_EXPIRY = float(os.getenv("MCV_KEEPALIVE_EXPIRY", 30))
+MCV_TIMEOUT = float(os.getenv("MCV_TIMEOUT", 10))
+MCV_CONNECT_TIMEOUT = float(os.getenv("MCV_CONNECT_TIMEOUT", 5))
+MCV_COALESCE_REQUESTS = os.getenv("MCV_COALESCE_REQUESTS", "true").lower() == "true"
+
+# MyCourseVille rate limiting, retries and circuit breaker
+MCV_RATE_LIMIT = float(os.getenv("MCV_RATE_LIMIT", 50))
+MCV_RATE_BURST = int(os.getenv("MCV_RATE_BURST", 100))
+MCV_USER_RATE_LIMIT = float(os.getenv("MCV_USER_RATE_LIMIT", 5))
+MCV_USER_RATE_BURST = int(os.getenv("MCV_USER_RATE_BURST", 20))
+MCV_RETRY_ATTEMPTS = int(os.getenv("MCV_RETRY_ATTEMPTS", 3))
+MCV_RETRY_BASE_DELAY = float(os.getenv("MCV_RETRY_BASE_DELAY", 0.5))
+MCV_RETRY_MAX_DELAY = float(os.getenv("MCV_RETRY_MAX_DELAY", 8))
+MCV_BREAKER_FAILURES = int(os.getenv("MCV_BREAKER_FAILURES", 5))
+MCV_BREAKER_RESET = float(os.getenv("MCV_BREAKER_RESET", 30))
+# Total time allowed per call including retries, e.g. "/get/course/roster=30"
+MCV_TIMEOUT_BUDGET = float(os.getenv("MCV_TIMEOUT_BUDGET", 20))
+MCV_TIMEOUT_BUDGETS = _float_mapping("MCV_TIMEOUT_BUDGETS")
+
+# Per-user response cache for read tools
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", 5000))
+RESPONSE_CACHE_DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_DEFAULT_TTL", 300))
+RESPONSE_CACHE_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", 600))
+# Per-endpoint overrides, e.g. "/get/course/info=3600,/get/course/assignments=120"
+RESPONSE_CACHE_TTLS = _float_mapping("RESPONSE_CACHE_TTLS")
+# Hold cached responses as shape-shared tuples with interned strings instead
+# of nested dicts (less memory per user, a copy is rebuilt on every hit)
+RESPONSE_CACHE_COMPACT = os.getenv("RESPONSE_CACHE_COMPACT", "true").lower() == "true"
+
+# Multi-course aggregate tools
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", 8))
+# Most distinct calls one run_query plan may make
+QUERY_MAX_CALLS = int(os.getenv("QUERY_MAX_CALLS", 100))
+
+# OAuth client/token storage: "disk" (SQLite), "redis" or "memory"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "disk").lower()
+STORAGE_DISK_PATH = os.getenv("STORAGE_DISK_PATH", "")
+STORAGE_REDIS_URL = os.getenv("STORAGE_REDIS_URL", "redis://localhost:6379/0")
+# Fernet key (base64, 32 bytes); derived from MCV_CLIENT_SECRET when empty
+STORAGE_ENCRYPTION_KEY = os.getenv("STORAGE_ENCRYPTION_KEY", "")
+STORAGE_LOCAL_CACHE_SIZE = int(os.getenv("STORAGE_LOCAL_CACHE_SIZE", 10000))
+STORAGE_LOCAL_CACHE_TTL = float(os.getenv("STORAGE_LOCAL_CACHE_TTL", 60))
+RESPONSE_CACHE_SHARED = os.getenv("RESPONSE_CACHE_SHARED", "false").lower() == "true"
+
+# Incremental course index
+SYNC_DB_PATH = os.getenv("SYNC_DB_PATH", "")
+SYNC_INTERVAL = float(os.getenv("SYNC_INTERVAL", 300))
+SYNC_ACTIVE_WINDOW = float(os.getenv("SYNC_ACTIVE_WINDOW", 1800))
+SYNC_BACKGROUND = os.getenv("SYNC_BACKGROUND", "true").lower() == "true"
+# Users whose due-date index is kept in memory; idle ones expire after SYNC_ACTIVE_WINDOW
+DEADLINE_INDEX_SIZE = int(os.getenv("DEADLINE_INDEX_SIZE", 1000))
+
+# Production serving (TRANSPORT=http): worker processes, seconds to let
+# in-flight requests finish on shutdown, and stateless streamable HTTP, which
+# multiple workers need because MCP sessions live in one process's memory
+# Rate limits, admission limits, the in-process response cache and /metrics
+# are per worker: effective limits are WORKERS times the configured ones
+WORKERS = int(os.getenv("WORKERS", 1))
+GRACEFUL_TIMEOUT = float(os.getenv("GRACEFUL_TIMEOUT", 30))
+STATELESS_HTTP = (os.getenv("STATELESS_HTTP") or str(WORKERS > 1)).lower() == "true"
+
+# Background prefetch of a user's courses after their token is first verified
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", 2))
+WARMUP_MAX_REQUESTS = int(os.getenv("WARMUP_MAX_REQUESTS", 12))
+WARMUP_MAX_COURSES = int(os.getenv("WARMUP_MAX_COURSES", 8))
+WARMUP_ENDPOINTS = [
+    e.strip()
+    for e in os.getenv("WARMUP_ENDPOINTS", "/get/course/info,/get/course/assignments").split(",")
+    if e.strip()
+]
+# Seconds before the same user is warmed up again
+WARMUP_COOLDOWN = float(os.getenv("WARMUP_COOLDOWN", 3600))
+
+# Tool-call responses: gzip for clients sending Accept-Encoding (SSE included),
+# and whether dict results from tools without an output schema also carry a
+# structured copy (structuredContent) next to their JSON text
+HTTP_COMPRESSION = os.getenv("HTTP_COMPRESSION", "true").lower() == "true"
+HTTP_COMPRESSION_MIN_SIZE = int(os.getenv("HTTP_COMPRESSION_MIN_SIZE", 1024))
+HTTP_COMPRESSION_LEVEL = int(os.getenv("HTTP_COMPRESSION_LEVEL", 6))
+TOOL_STRUCTURED_CONTENT = os.getenv("TOOL_STRUCTURED_CONTENT", "true").lower() == "true"
+
+# Admission control for tool calls: execution slots overall and per user,
+# how many calls may wait (overall and per user) and for how long before
+# failing with a "busy" error, and relative tool costs for fair queuing,
+# e.g. "get_all_materials=4,get_student_roster=2"
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", 64))
+ADMISSION_USER_CONCURRENCY = int(os.getenv("ADMISSION_USER_CONCURRENCY", 4))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 256))
+ADMISSION_USER_QUEUE = int(os.getenv("ADMISSION_USER_QUEUE", 32))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 15))
+ADMISSION_TOOL_COSTS = _float_mapping("ADMISSION_TOOL_COSTS")
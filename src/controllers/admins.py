@@ -1,17 +1,136 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_access_token
-import httpx
 
+from cache.response import fetch_cached, user_key
+from sync.engine import sync_engine
+from sync.store import content_hash
+from utils.columns import Table
+from utils.payload import records
+from utils.progress import report_progress
+from utils.projection import COMPACT_FIELDS, project, project_item
+
+SUMMARY_COLUMNS = ("department", "year", "section", "role")
+STUDENT_KEYS = ("student_id", "uid", "id")
+
+
+async def _roster(courseId: str, refresh: bool):
+    return await fetch_cached(
+        get_access_token(), "/get/course/roster", {"cv_cid": courseId}, refresh=refresh
+    )
+
+
+async def get_student_roster(
+    courseId: str,
+    fields: list[str] | None = None,
+    where: dict[str, str | list[str]] | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    refresh: bool = False,
+):
+    """Use `fields=["*"]` for every field; page with `limit` and `next_cursor`.
+
+    `where` keeps students whose fields match, e.g. `{"department": "Computer Engineering", "year": ["1", "2"]}`.
+    """
+    await report_progress(0, 1, "Fetching roster")
+    roster = await _roster(courseId, refresh)
+    await report_progress(1, 1, f"Fetched {len(records(roster))} students")
+    if where:
+        matched = Table.from_rows(records(roster)).where(where).rows()
+        roster = {**roster, "data": matched} if isinstance(roster, dict) else matched
+    return project(roster, "roster", fields=fields, strip=False, limit=limit, cursor=cursor)
+
+
+async def get_roster_summary(
+    courseId: str,
+    group_by: list[str] | None = None,
+    where: dict[str, str | list[str]] | None = None,
+    top: int = 50,
+    refresh: bool = False,
+):
+    """Student counts for a course roster, computed server-side.
+
+    By default counts students by department, year, section and role separately.
+    `group_by=["department", "year"]` counts each combination instead (largest
+    first, at most `top` groups); `where` filters students first.
+    """
+    table = Table.from_rows(records(await _roster(courseId, refresh)))
+    matched = table.where(where)
+    result = {"total": table.size, "matched": matched.size}
+    if group_by:
+        counts = matched.counts(group_by)
+        groups = counts.most_common(top) if top else counts.most_common()
+        result["groups"] = [
+            {**dict(zip(group_by, key if len(group_by) > 1 else (key,))), "count": count}
+            for key, count in groups
+        ]
+        result["group_count"] = len(counts)
+    else:
+        result["counts"] = {
+            column: {str(value): count for value, count in matched.counts([column]).most_common()}
+            for column in SUMMARY_COLUMNS
+            if column in table.columns
+        }
+    return result
+
+
+def _student_key(student: dict) -> str:
+    for field in STUDENT_KEYS:
+        if student.get(field) not in (None, ""):
+            return str(student[field])
+    # No id: the whole row identifies the student, so a change reads as removed + added.
+    return "#" + content_hash(student)[:16]
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+async def get_roster_changes(
+    courseId: str,
+    refresh: bool = True,
+):
+    """Students added to, removed from or changed in a course roster.
 
-async def get_student_roster(courseId: str):
+    Compares the current roster with the snapshot saved when this tool was last
+    called for the course. The first call only saves a snapshot.
+    """
     token = get_access_token()
-    access_token = token.token
+    user_id = user_key(token)
+    store = sync_engine.store
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/course/roster?cv_cid={courseId}"
+    roster = [s for s in records(await _roster(courseId, refresh)) if isinstance(s, dict)]
+    now = time.time()
+    previous = await asyncio.to_thread(store.snapshot, user_id, courseId, "roster")
+    await asyncio.to_thread(store.save_snapshot, user_id, courseId, "roster", roster, now)
+    if previous is None:
+        return {
+            "total": len(roster),
+            "message": "Saved the first snapshot of this roster; call again later to see changes.",
+        }
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        roster = resp.json()
-        return roster
+    taken_at, old_roster = previous
+    fields = COMPACT_FIELDS["roster"]
+    old = {_student_key(s): s for s in old_roster}
+    new = {_student_key(s): s for s in roster}
+    changed = []
+    for key in sorted(old.keys() & new.keys(), key=str):
+        diff = {
+            field: [old[key].get(field), new[key].get(field)]
+            for field in fields
+            if old[key].get(field) != new[key].get(field)
+        }
+        if diff:
+            changed.append({"student": key, "changes": diff})
+    return {
+        "previous_snapshot_at": _iso(taken_at),
+        "current_snapshot_at": _iso(now),
+        "previous_total": len(old_roster),
+        "total": len(roster),
+        "added": [project_item(new[k], fields, strip=False) for k in sorted(new.keys() - old.keys(), key=str)],
+        "removed": [project_item(old[k], fields, strip=False) for k in sorted(old.keys() - new.keys(), key=str)],
+        "changed": changed,
+    }
@@ -1,120 +1,273 @@
+import asyncio
+import heapq
+from operator import itemgetter
+
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_access_token
-import httpx
 
+from cache.response import fetch_cached
+from clients import mcv
+from config.contants import FANOUT_CONCURRENCY
+from controllers.resources import resource_uri
+from utils.payload import course_summary, records, timestamp
+from utils.progress import muted, report_progress
+from utils.projection import page_of, project
 
-async def list_all_courses():
-    token = get_access_token()
-    access_token = token.token
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = "https://www.mycourseville.com/api/v1/public/get/user/courses?detail=1"
+async def list_all_courses(refresh: bool = False):
+    token = get_access_token()
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        courses = resp.json()
-        return courses
+    courses = await fetch_cached(
+        token, "/get/user/courses", {"detail": 1}, refresh=refresh
+    )
+    return courses
 
 
-async def get_course_infos(courseId: str):
+async def get_course_infos(courseId: str, refresh: bool = False):
     token = get_access_token()
-    access_token = token.token
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = (
-        f"https://www.mycourseville.com/api/v1/public/get/course/info?cv_cid={courseId}"
+    courses = await fetch_cached(
+        token, "/get/course/info", {"cv_cid": courseId}, refresh=refresh
     )
+    return courses
+
+
+async def get_course_materials(
+    courseId: str,
+    fields: list[str] | None = None,
+    strip_html: bool = True,
+    limit: int | None = None,
+    cursor: str | None = None,
+    refresh: bool = False,
+):
+    """Use `fields=["*"]` for every field; page with `limit` and `next_cursor`."""
+    token = get_access_token()
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        courses = resp.json()
-        return courses
+    await report_progress(0, 1, "Fetching materials")
+    courses = await fetch_cached(
+        token,
+        "/get/course/materials",
+        {"cv_cid": courseId, "detail": 1, "published": 1},
+        refresh=refresh,
+    )
+    await report_progress(1, 1, f"Fetched {len(records(courses))} materials")
+    return project(
+        courses, "materials", fields=fields, strip=strip_html, limit=limit, cursor=cursor
+    )
 
 
-async def get_course_materials(courseId: str):
+async def get_course_assignments(
+    courseId: str,
+    fields: list[str] | None = None,
+    strip_html: bool = True,
+    limit: int | None = None,
+    cursor: str | None = None,
+    refresh: bool = False,
+):
+    """Use `fields=["*"]` for every field; page with `limit` and `next_cursor`."""
     token = get_access_token()
-    access_token = token.token
-
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/course/materials?cv_cid={courseId}&detail=1&published=1"
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        courses = resp.json()
-        return courses
+    courses = await fetch_cached(
+        token,
+        "/get/course/assignments",
+        {"cv_cid": courseId, "detail": 1, "published": 1},
+        refresh=refresh,
+    )
+    return project(
+        courses, "assignments", fields=fields, strip=strip_html, limit=limit, cursor=cursor
+    )
 
 
-async def get_course_assignments(courseId: str):
+async def get_course_announcements(
+    courseId: str,
+    fields: list[str] | None = None,
+    strip_html: bool = True,
+    limit: int | None = None,
+    cursor: str | None = None,
+    refresh: bool = False,
+):
+    """Use `fields=["*"]` for every field; page with `limit` and `next_cursor`."""
     token = get_access_token()
-    access_token = token.token
-
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/course/assignments?cv_cid={courseId}&detail=1&published=1"
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        courses = resp.json()
-        return courses
+    courses = await fetch_cached(
+        token,
+        "/get/course/announcements",
+        {"cv_cid": courseId, "detail": 1, "published": 1},
+        refresh=refresh,
+    )
+    return project(
+        courses, "announcements", fields=fields, strip=strip_html, limit=limit, cursor=cursor
+    )
 
 
-async def get_course_announcements(courseId: str):
+async def get_assignment(itemID: str):
     token = get_access_token()
     access_token = token.token
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/course/announcements?cv_cid={courseId}&detail=1&published=1"
+    courses = await mcv.fetch("/get/item/assignment", access_token, {"item_id": itemID})
+    return courses
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        courses = resp.json()
-        return courses
 
+async def get_playlist(courseId: str, refresh: bool = False):
+    token = get_access_token()
 
-async def get_assignment(itemID: str):
+    playlist = await fetch_cached(
+        token, "/get/course/playlists", {"cv_cid": courseId}, refresh=refresh
+    )
+    return {
+        "suggestion": "Add the youtube link for the ready-to-use, from the youtube playlist field",
+        "data": playlist,
+    }
+
+
+async def get_online_meetings(courseId: str, refresh: bool = False):
     token = get_access_token()
-    access_token = token.token
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/item/assignment?item_id={itemID}"
+    meetings = await fetch_cached(
+        token, "/get/course/onlinemeetings", {"cv_cid": courseId}, refresh=refresh
+    )
+    return meetings
+
+
+def _sort_key(fields: tuple[str, ...], newest_first: bool):
+    def key(item: dict):
+        ts = timestamp(item, *fields)
+        if ts is None:
+            return (1, 0.0)
+        return (0, -ts if newest_first else ts)
+
+    return key
+
+
+async def _enrolled_courses(refresh: bool) -> list[dict]:
+    courses = {}
+    for course in records(await list_all_courses(refresh=refresh)):
+        if isinstance(course, dict) and course.get("cv_cid") is not None:
+            courses.setdefault(str(course["cv_cid"]), course)
+    return list(courses.values())
+
+
+async def _fan_out(
+    fetch_course,
+    sort_fields: tuple[str, ...],
+    newest_first: bool,
+    refresh: bool,
+    limit: int | None = None,
+    cursor: str | None = None,
+    resource: str | None = None,
+):
+    """Call ``fetch_course`` for every enrolled course and merge the results.
+
+    Courses are fetched concurrently (bounded by FANOUT_CONCURRENCY) and a
+    progress notification is sent as each one completes; a failing course is
+    reported under ``errors`` without dropping the others. Each course's list
+    is sorted as it arrives, and the sorted lists are merged lazily up to the
+    end of the requested page, so the merged list is never built or sorted as
+    a whole. When more pages follow, ``remaining`` links the ``resource`` of
+    every course with items past this page.
+    """
+    courses = await _enrolled_courses(refresh)
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    key = _sort_key(sort_fields, newest_first)
+
+    async def fetch_one(course: dict):
+        async with semaphore:
+            try:
+                with muted():
+                    return course, await fetch_course(str(course["cv_cid"]), refresh=refresh), None
+            except Exception as e:
+                return course, None, str(e) or type(e).__name__
+
+    results = {}
+    for done, next_result in enumerate(asyncio.as_completed([fetch_one(c) for c in courses]), 1):
+        course, payload, error = await next_result
+        if error is None:
+            items = [(key(item), item) for item in records(payload) if isinstance(item, dict)]
+            items.sort(key=itemgetter(0))
+            payload = items
+        results[str(course["cv_cid"])] = (payload, error)
+        await report_progress(done, len(courses), f"Fetched {course.get('course_no') or course['cv_cid']}")
+
+    lists, errors = [], []
+    for course in courses:
+        items, error = results[str(course["cv_cid"])]
+        summary = course_summary(course)
+        if error is not None:
+            errors.append({**summary, "error": error})
+        elif items:
+            lists.append((summary, items))
+
+    # heapq.merge buffers the head of every list, so count what it emits
+    # (the skipped offset and the page), not what it pulls from each list.
+    emitted = [0] * len(lists)
+
+    def tagged(n: int, items: list):
+        for sort_key, item in items:
+            yield sort_key, n, item
+
+    def counted(merged):
+        for _, n, item in merged:
+            emitted[n] += 1
+            yield item, lists[n][0]
+
+    merged = heapq.merge(*(tagged(n, items) for n, (_, items) in enumerate(lists)), key=itemgetter(0))
+    total = sum(len(items) for _, items in lists)
+    page, next_cursor = page_of(counted(merged), total, limit, cursor)
+    result = {
+        "course_count": len(courses),
+        "item_count": total,
+        "items": [{**item, "course": summary} for item, summary in page],
+        "next_cursor": next_cursor,
+        "errors": errors,
+    }
+    if next_cursor is not None and resource is not None:
+        result["remaining"] = [
+            {**summary, "items": len(items) - seen, "uri": resource_uri(summary["cv_cid"], resource)}
+            for (summary, items), seen in zip(lists, emitted)
+            if seen < len(items)
+        ]
+    return result
+
+
+async def get_all_assignments(refresh: bool = False, limit: int | None = None, cursor: str | None = None):
+    """Assignments of every enrolled course, soonest due date first.
+
+    Page with `limit` and `next_cursor`.
+    """
+    return await _fan_out(
+        get_course_assignments, ("duetime", "duedate"), newest_first=False,
+        refresh=refresh, limit=limit, cursor=cursor, resource="assignments",
+    )
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        courses = resp.json()
-        return courses
 
+async def get_all_announcements(refresh: bool = False, limit: int | None = None, cursor: str | None = None):
+    """Announcements of every enrolled course, newest first.
 
-async def get_playlist(courseId: str):
-    token = get_access_token()
-    access_token = token.token
+    Page with `limit` and `next_cursor`.
+    """
+    return await _fan_out(
+        get_course_announcements, ("createdtime", "created"), newest_first=True,
+        refresh=refresh, limit=limit, cursor=cursor, resource="announcements",
+    )
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/course/playlists?cv_cid={courseId}"
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        playlist = resp.json()
-        return {
-            "suggestion": "Add the youtube link for the ready-to-use, from the youtube playlist field",
-            "data": playlist,
-        }
+async def get_all_materials(refresh: bool = False, limit: int | None = None, cursor: str | None = None):
+    """Materials of every enrolled course, newest first.
 
+    Page with `limit` and `next_cursor`.
+    """
+    return await _fan_out(
+        get_course_materials, ("created", "createdtime"), newest_first=True,
+        refresh=refresh, limit=limit, cursor=cursor, resource="materials",
+    )
 
-async def get_online_meetings(courseId: str):
-    token = get_access_token()
-    access_token = token.token
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/course/onlinemeetings?cv_cid={courseId}"
+async def get_all_online_meetings(refresh: bool = False, limit: int | None = None, cursor: str | None = None):
+    """Online meetings of every enrolled course, earliest start first.
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        meetings = resp.json()
-        return meetings
\ No newline at end of file
+    Page with `limit` and `next_cursor`.
+    """
+    return await _fan_out(
+        get_online_meetings, ("start_time", "starttime", "date"), newest_first=False,
+        refresh=refresh, limit=limit, cursor=cursor,
+    )
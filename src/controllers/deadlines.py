@@ -0,0 +1,79 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from fastmcp.server.dependencies import get_access_token
+
+from cache.response import user_key
+from sync.deadlines import Deadline, deadline_index, to_ical
+from sync.engine import sync_engine
+from utils.payload import course_summary
+
+
+def _matches(course: dict, course_filter: str) -> bool:
+    needle = course_filter.strip().lower()
+    return str(course.get("cv_cid")) == course_filter.strip() or any(
+        needle in str(course.get(field) or "").lower() for field in ("course_no", "title")
+    )
+
+
+async def _deadlines(
+    days: int, course_filter: str | None, include_overdue: int, refresh: bool
+) -> tuple[list[Deadline], dict[str, dict], float, dict | None]:
+    token = get_access_token()
+    user_id = user_key(token)
+    sync = await sync_engine.ensure_synced(token, refresh=refresh)
+    now = time.time()
+    courses = await asyncio.to_thread(sync_engine.store.courses, user_id)
+    if course_filter:
+        courses = {cv_cid: c for cv_cid, c in courses.items() if _matches(c, course_filter)}
+    deadlines = await deadline_index.upcoming(
+        user_id, now - include_overdue * 86_400, now + days * 86_400
+    )
+    return [d for d in deadlines if d.cv_cid in courses], courses, now, sync
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+async def get_upcoming_deadlines(
+    days: int = 14,
+    course_filter: str | None = None,
+    include_overdue: int = 0,
+    refresh: bool = False,
+) -> dict:
+    """My assignment deadlines in the next `days` days across all courses, soonest first.
+
+    `course_filter` matches a course id, course number or part of the title.
+    `include_overdue` also lists deadlines from that many past days.
+    """
+    deadlines, courses, now, sync = await _deadlines(days, course_filter, include_overdue, refresh)
+    response = {
+        "now": _iso(now),
+        "count": len(deadlines),
+        "deadlines": [
+            {
+                "due": _iso(d.due),
+                "overdue": d.due < now,
+                "hours_left": round((d.due - now) / 3600, 1),
+                "item_id": d.item_id,
+                "title": d.title,
+                "course": course_summary(courses[d.cv_cid]),
+            }
+            for d in deadlines
+        ],
+    }
+    if sync is not None and sync["errors"]:
+        response["errors"] = sync["errors"]
+    return response
+
+
+async def export_deadlines_ical(
+    days: int = 60,
+    course_filter: str | None = None,
+    refresh: bool = False,
+) -> str:
+    """My upcoming assignment deadlines as an iCalendar (.ics) file to import into a calendar app."""
+    deadlines, courses, now, _ = await _deadlines(days, course_filter, 0, refresh)
+    return to_ical(deadlines, courses, now)
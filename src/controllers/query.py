@@ -0,0 +1,282 @@
+"""Composite queries: a small plan of controller calls run in one request.
+
+A plan is a list of steps. A step calls one read tool, either once or once
+per row of an earlier step (``for_each``), with arguments that may take values
+from that row (``"$.cv_cid"``). Steps run as a dependency graph: a step starts
+as soon as the step it depends on is done, independent steps run concurrently,
+and the calls within a step run concurrently (bounded by
+``FANOUT_CONCURRENCY``). Identical calls in the same plan are made once.
+Rows can be filtered (``where``), trimmed to some fields (``fields``) and
+capped (``limit``), so the combined result stays compact.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import re
+import time
+
+from fastmcp.utilities.types import get_cached_typeadapter
+
+from config.contants import FANOUT_CONCURRENCY, QUERY_MAX_CALLS
+from controllers import admins, courses, users
+from utils.payload import records, timestamp
+from utils.progress import muted, report_progress
+from utils.projection import project_item
+
+CALLS = {
+    fn.__name__: fn
+    for fn in (
+        users.get_me,
+        users.get_user_gradeletter,
+        courses.list_all_courses,
+        courses.get_course_infos,
+        courses.get_course_materials,
+        courses.get_course_assignments,
+        courses.get_course_announcements,
+        courses.get_assignment,
+        courses.get_playlist,
+        courses.get_online_meetings,
+        admins.get_student_roster,
+    )
+}
+
+STEP_KEYS = {"id", "call", "args", "for_each", "where", "fields", "limit"}
+RANGE_OPS = {"gt", "gte", "lt", "lte"}
+
+_RELATIVE = re.compile(r"^now(?:([+-]\d+(?:\.\d+)?)([smhdw]))?$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def _norm(value) -> str:
+    return str(value).strip().casefold() if value is not None else ""
+
+
+def _instant(value) -> float:
+    """A number, an ISO 8601 date/time or "now" / "now+7d" / "now-12h" as Unix seconds."""
+    if isinstance(value, str):
+        match = _RELATIVE.match(value.strip().lower())
+        if match:
+            amount, unit = match.groups()
+            return time.time() + (float(amount) * _UNITS[unit] if amount else 0)
+    ts = timestamp({"value": value}, "value")
+    if ts is None:
+        raise ValueError(f"Invalid time or number {value!r} in where")
+    return ts
+
+
+def _matches(row: dict, where: dict) -> bool:
+    for field, expected in where.items():
+        value = row.get(field)
+        if isinstance(expected, dict):
+            if "contains" in expected and _norm(expected["contains"]) not in _norm(value):
+                return False
+            bounds = {op: bound for op, bound in expected.items() if op in RANGE_OPS}
+            if bounds:
+                actual = timestamp(row, field)
+                if actual is None:
+                    return False
+                for op, bound in bounds.items():
+                    limit = _instant(bound)
+                    if not {
+                        "gt": actual > limit,
+                        "gte": actual >= limit,
+                        "lt": actual < limit,
+                        "lte": actual <= limit,
+                    }[op]:
+                        return False
+        elif _norm(value) not in {_norm(v) for v in (expected if isinstance(expected, list) else [expected])}:
+            return False
+    return True
+
+
+def _is_ref(value) -> bool:
+    return isinstance(value, str) and value.startswith("$.")
+
+
+def _rows(result) -> list[dict]:
+    """The records in a tool result; a single object is one row."""
+    rows = [row for row in records(result) if isinstance(row, dict)]
+    if not rows:
+        data = result.get("data", result) if isinstance(result, dict) else result
+        if isinstance(data, dict) and data:
+            rows = [data]
+    return rows
+
+
+def _validate(steps: list[dict]) -> dict[str, dict]:
+    plan: dict[str, dict] = {}
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise ValueError(f"Step {index} must be an object")
+        step_id = step.get("id") or f"step{index}"
+        unknown = set(step) - STEP_KEYS
+        if unknown:
+            raise ValueError(f"Step {step_id!r} has unknown keys {sorted(unknown)}; use {sorted(STEP_KEYS)}")
+        if step_id in plan:
+            raise ValueError(f"Duplicate step id {step_id!r}")
+        if step.get("call") not in CALLS:
+            raise ValueError(f"Step {step_id!r} calls {step.get('call')!r}; use one of {sorted(CALLS)}")
+        parent = step.get("for_each")
+        if parent is not None and parent not in plan:
+            raise ValueError(f"Step {step_id!r} iterates over {parent!r}, which is not an earlier step")
+        if parent is None and any(_is_ref(value) for value in (step.get("args") or {}).values()):
+            raise ValueError(f"Step {step_id!r} reads arguments from a row but has no for_each")
+        for field, expected in (step.get("where") or {}).items():
+            if isinstance(expected, dict) and not set(expected) <= RANGE_OPS | {"contains"}:
+                raise ValueError(
+                    f"Step {step_id!r} filters {field!r} with {sorted(expected)}; "
+                    f"use {sorted(RANGE_OPS | {'contains'})}"
+                )
+        plan[step_id] = step
+    return plan
+
+
+class _Query:
+    def __init__(self, plan: dict[str, dict], refresh: bool, max_calls: int):
+        self.plan = plan
+        self.refresh = refresh
+        self.max_calls = max_calls
+        self.semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+        self.calls: dict[tuple, asyncio.Task] = {}
+        self.deduplicated = 0
+        self.done = 0
+        self.steps: dict[str, asyncio.Task] = {}
+
+    def _args(self, step: dict, row: dict | None) -> dict:
+        args = {}
+        for name, value in (step.get("args") or {}).items():
+            if _is_ref(value):
+                value = row.get(value[2:])
+                # Ids are passed as strings, like the tools receive them.
+                value = None if value is None else str(value)
+            args[name] = value
+        fn = CALLS[step["call"]]
+        if "refresh" in inspect.signature(fn).parameters:
+            args.setdefault("refresh", self.refresh)
+        return args
+
+    async def _call(self, name: str, args: dict):
+        key = (name, tuple(sorted((k, repr(v)) for k, v in args.items())))
+        task = self.calls.get(key)
+        if task is not None:
+            self.deduplicated += 1
+            return await task
+        if len(self.calls) >= self.max_calls:
+            raise ValueError(f"Query needs more than {self.max_calls} calls; narrow it with where or limit")
+
+        async def run():
+            async with self.semaphore:
+                try:
+                    # Validated like a tool call, so defaults and types apply.
+                    with muted():
+                        return await get_cached_typeadapter(CALLS[name]).validate_python(args)
+                finally:
+                    self.done += 1
+                    await report_progress(self.done, len(self.calls), f"{name} {self.done}/{len(self.calls)}")
+
+        task = self.calls[key] = asyncio.ensure_future(run())
+        return await task
+
+    async def _step(self, step_id: str) -> dict:
+        step = self.plan[step_id]
+        parent = step.get("for_each")
+        if parent is None:
+            inputs = [None]
+        else:
+            inputs = (await self.steps[parent])["rows"]
+
+        async def one(row: dict | None):
+            args = self._args(step, row)
+            try:
+                return args, await self._call(step["call"], args), None
+            except Exception as e:
+                return args, None, str(e) or type(e).__name__
+
+        # Arguments taken from the parent row are kept on each row as "_via".
+        refs = [name for name, value in (step.get("args") or {}).items() if _is_ref(value)]
+        rows, errors = [], []
+        for args, result, error in await asyncio.gather(*(one(row) for row in inputs)):
+            via = {name: args[name] for name in refs}
+            if error is not None:
+                errors.append({"step": step_id, "args": args, "error": error})
+                continue
+            for item in _rows(result):
+                if via:
+                    item = {**item, "_via": via}
+                rows.append(item)
+
+        where = step.get("where")
+        if where:
+            rows = [row for row in rows if _matches(row, where)]
+        total = len(rows)
+        if step.get("limit") is not None:
+            rows = rows[: max(int(step["limit"]), 0)]
+        return {"rows": rows, "total": total, "calls": len(inputs), "errors": errors}
+
+    async def run(self) -> dict[str, dict]:
+        for step_id in self.plan:
+            self.steps[step_id] = asyncio.ensure_future(self._step(step_id))
+        try:
+            return dict(zip(self.plan, await asyncio.gather(*self.steps.values())))
+        finally:
+            for task in (*self.steps.values(), *self.calls.values()):
+                task.cancel()
+
+
+async def run_query(
+    steps: list[dict],
+    output: list[str] | None = None,
+    strip_html: bool = True,
+    refresh: bool = False,
+) -> dict:
+    """Run several MyCourseVille calls in one request and return one combined result.
+
+    Each step is `{"id", "call", "args", "for_each", "where", "fields", "limit"}`:
+    - `call`: list_all_courses, get_course_infos, get_course_assignments,
+      get_course_materials, get_course_announcements, get_assignment,
+      get_playlist, get_online_meetings, get_user_gradeletter,
+      get_student_roster or get_me.
+    - `for_each`: id of an earlier step; the call runs once per row of it, and
+      `args` values like `"$.cv_cid"` are read from that row.
+    - `where`: `{"field": value}` or a list of values (case-insensitive), or
+      `{"field": {"gte": ..., "lt": ...}}` with numbers, ISO dates or
+      `"now"`, `"now+7d"`, `"now-12h"`, or `{"field": {"contains": "text"}}`.
+    - `fields`: keep only these fields per row; `limit`: keep the first rows.
+
+    Example, assignments due this week in 2025 semester 1 courses:
+    `[{"id": "courses", "call": "list_all_courses", "where": {"year": 2025, "semester": 1}},
+      {"id": "hw", "call": "get_course_assignments", "for_each": "courses",
+       "args": {"courseId": "$.cv_cid"}, "where": {"duetime": {"gte": "now", "lt": "now+7d"}}},
+      {"id": "details", "call": "get_assignment", "for_each": "hw", "args": {"itemID": "$.itemid"}}]`
+
+    Returns the rows of the `output` steps (by default the steps nothing
+    depends on) plus call counts and per-call errors.
+    """
+    plan = _validate(steps)
+    unknown = set(output or ()) - set(plan)
+    if unknown:
+        raise ValueError(f"Unknown output steps {sorted(unknown)}")
+    if output is None:
+        parents = {step.get("for_each") for step in plan.values()}
+        output = [step_id for step_id in plan if step_id not in parents]
+
+    query = _Query(plan, refresh, QUERY_MAX_CALLS)
+    results = await query.run()
+
+    combined = {}
+    for step_id in output:
+        result = results[step_id]
+        fields = plan[step_id].get("fields")
+        selected = tuple(fields) if fields else None
+        combined[step_id] = {
+            "rows": [project_item(row, selected, strip_html) for row in result["rows"]],
+            "total": result["total"],
+        }
+    return {
+        "steps": combined,
+        "calls": len(query.calls),
+        "deduplicated": query.deduplicated,
+        "errors": [error for result in results.values() for error in result["errors"]],
+    }
@@ -0,0 +1,72 @@
+"""Course data as MCP resources: ``mcv://course/{cv_cid}/{kind}``.
+
+Reads go through the response cache like the tools, so a re-read within the
+TTL does not touch MyCourseVille and a stale entry is revalidated in the
+background. Each document carries a ``version`` (content hash) that changes
+only when the content does.
+"""
+
+from fastmcp.server.dependencies import get_access_token
+
+from cache.response import fetch_cached
+from sync.store import content_hash
+from sync.subscriptions import URI_PREFIX
+from utils.projection import project
+
+
+def resource_uri(cv_cid: str, kind: str) -> str:
+    return f"{URI_PREFIX}/{cv_cid}/{kind}"
+
+
+def _document(cv_cid: str, kind: str, data) -> dict:
+    return {
+        "uri": resource_uri(cv_cid, kind),
+        "version": content_hash(data)[:16],
+        "data": data,
+    }
+
+
+async def _fetch(path: str, params: dict):
+    payload = await fetch_cached(get_access_token(), path, params)
+    return payload.get("data", payload) if isinstance(payload, dict) else payload
+
+
+async def course_info(cv_cid: str) -> dict:
+    """Course information."""
+    return _document(cv_cid, "info", await _fetch("/get/course/info", {"cv_cid": cv_cid}))
+
+
+async def course_syllabus(cv_cid: str) -> dict:
+    """Course syllabus, taken from the course information."""
+    info = await _fetch("/get/course/info", {"cv_cid": cv_cid})
+    syllabus = {k: v for k, v in info.items() if "syllabus" in k} if isinstance(info, dict) else {}
+    return _document(cv_cid, "syllabus", syllabus)
+
+
+async def _course_list(cv_cid: str, kind: str, path: str) -> dict:
+    payload = await fetch_cached(
+        get_access_token(), path, {"cv_cid": cv_cid, "detail": 1, "published": 1}
+    )
+    projected = project(payload, kind)
+    data = projected.get("data", projected) if isinstance(projected, dict) else projected
+    return _document(cv_cid, kind, data)
+
+
+async def course_materials(cv_cid: str) -> dict:
+    """Course materials (compact fields, HTML stripped)."""
+    return await _course_list(cv_cid, "materials", "/get/course/materials")
+
+
+async def course_assignments(cv_cid: str) -> dict:
+    """Course assignments (compact fields, HTML stripped)."""
+    return await _course_list(cv_cid, "assignments", "/get/course/assignments")
+
+
+async def course_announcements(cv_cid: str) -> dict:
+    """Course announcements (compact fields, HTML stripped)."""
+    return await _course_list(cv_cid, "announcements", "/get/course/announcements")
+
+
+async def course_playlists(cv_cid: str) -> dict:
+    """Course video playlists."""
+    return _document(cv_cid, "playlists", await _fetch("/get/course/playlists", {"cv_cid": cv_cid}))
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime, timezone
+
+from fastmcp.server.dependencies import get_access_token
+
+from cache.response import user_key
+from sync.engine import KINDS, sync_engine
+from utils.payload import course_summary
+from utils.projection import COMPACT_FIELDS, project_item
+
+
+def _parse_since(since: str) -> float:
+    try:
+        return float(since)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(since).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid since {since!r}; use ISO 8601 or Unix seconds") from None
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+async def get_changes_since(
+    since: str,
+    kinds: list[str] | None = None,
+    courseId: str | None = None,
+    limit: int = 50,
+    refresh: bool = False,
+) -> dict:
+    """What changed in my courses since a point in time: new, updated and removed
+    assignments, announcements and materials, newest first.
+
+    `since` is an ISO 8601 date/time or Unix seconds. Answered from a local index
+    that is kept in sync in the background; pass `refresh=True` to sync first.
+    """
+    since_ts = _parse_since(since)
+    unknown = set(kinds or ()) - set(KINDS)
+    if unknown:
+        raise ValueError(f"Unknown kinds {sorted(unknown)}; use {sorted(KINDS)}")
+
+    token = get_access_token()
+    user_id = user_key(token)
+    sync = await sync_engine.ensure_synced(token, refresh=refresh)
+    store = sync_engine.store
+    changes, courses, synced_at = await asyncio.gather(
+        asyncio.to_thread(store.changes_since, user_id, since_ts, kinds, courseId, limit),
+        asyncio.to_thread(store.courses, user_id),
+        asyncio.to_thread(store.last_synced, user_id),
+    )
+
+    result = []
+    for change in changes:
+        if change["deleted_at"] is not None and change["deleted_at"] > since_ts:
+            kind_of_change = "deleted"
+        elif change["created_at"] > since_ts:
+            kind_of_change = "added"
+        else:
+            kind_of_change = "updated"
+        result.append(
+            {
+                "change": kind_of_change,
+                "kind": change["kind"],
+                "at": _iso(change["deleted_at"] if kind_of_change == "deleted" else change["changed_at"]),
+                "course": course_summary(courses.get(change["cv_cid"], {"cv_cid": change["cv_cid"]})),
+                "item": project_item(change["item"], COMPACT_FIELDS.get(change["kind"]), strip=True),
+            }
+        )
+    response = {
+        "since": _iso(since_ts),
+        "synced_at": _iso(synced_at),
+        "count": len(result),
+        "changes": result,
+    }
+    if sync is not None and sync["errors"]:
+        response["errors"] = sync["errors"]
+    return response
+
+
+async def search_course_content(
+    query: str,
+    kinds: list[str] | None = None,
+    courseId: str | None = None,
+    limit: int = 10,
+    refresh: bool = False,
+) -> dict:
+    """Full-text search over my assignments, announcements and materials (Thai or English).
+
+    Returns ranked hits with a short snippet instead of whole lists; fetch full
+    details only for the hits you need, e.g. `get_assignment(item_id)`. Terms
+    must be at least 3 characters.
+    """
+    unknown = set(kinds or ()) - set(KINDS)
+    if unknown:
+        raise ValueError(f"Unknown kinds {sorted(unknown)}; use {sorted(KINDS)}")
+
+    token = get_access_token()
+    user_id = user_key(token)
+    sync = await sync_engine.ensure_synced(token, refresh=refresh)
+    store = sync_engine.store
+    hits, courses = await asyncio.gather(
+        asyncio.to_thread(store.search, user_id, query, kinds, courseId, limit),
+        asyncio.to_thread(store.courses, user_id),
+    )
+
+    results = [
+        {
+            "kind": hit["kind"],
+            "item_id": hit["item_id"],
+            "title": hit["item"].get("title"),
+            "course": course_summary(courses.get(hit["cv_cid"], {"cv_cid": hit["cv_cid"]})),
+            "snippet": hit["snippet"],
+            "score": round(hit["score"], 3),
+        }
+        for hit in hits
+    ]
+    response = {"query": query, "count": len(results), "results": results}
+    if sync is not None and sync["errors"]:
+        response["errors"] = sync["errors"]
+    return response
@@ -1,6 +1,19 @@
+import asyncio
+
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_access_token
-import httpx
+
+from cache.response import fetch_cached
+from config.contants import FANOUT_CONCURRENCY
+from utils.payload import course_summary, records
+from utils.progress import report_progress
+
+# Grade points of the letter grades that count towards a GPA; others (S, U,
+# W, I, ...) are reported but left out of it.
+GRADE_POINTS = {
+    "A": 4.0, "B+": 3.5, "B": 3.0, "C+": 2.5, "C": 2.0, "D+": 1.5, "D": 1.0, "F": 0.0,
+}
+GRADE_FIELDS = ("grade", "gradeletter", "grade_letter", "letter")
 
 async def get_me() -> dict:
     """Get the user's information."""
@@ -10,15 +23,97 @@ async def get_me() -> dict:
         "user": token.claims,
     }
 
-async def get_user_gradeletter(courseId: str):
+async def get_user_gradeletter(courseId: str, refresh: bool = False):
+    token = get_access_token()
+
+    gradeletter = await fetch_cached(
+        token, "/get/user/gradeletter", {"cv_cid": courseId}, refresh=refresh
+    )
+    return gradeletter
+
+
+def _grade(payload) -> tuple[str | None, float | None]:
+    data = payload.get("data", payload) if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return None, None
+    letter = next((str(data[f]).strip().upper() for f in GRADE_FIELDS if data.get(f)), None)
+    try:
+        credit = float(data.get("credit") or data.get("credits"))
+    except (TypeError, ValueError):
+        credit = None
+    return letter, credit
+
+
+def _gpa(rows: list[dict]) -> tuple[float | None, float]:
+    """Credit-weighted GPA (unweighted when no credits are known) and credits counted."""
+    graded = [r for r in rows if r["points"] is not None]
+    weighted = [r for r in graded if r["credit"]]
+    if weighted:
+        credits = sum(r["credit"] for r in weighted)
+        return round(sum(r["points"] * r["credit"] for r in weighted) / credits, 2), credits
+    if graded:
+        return round(sum(r["points"] for r in graded) / len(graded), 2), 0.0
+    return None, 0.0
+
+
+async def get_all_gradeletters(refresh: bool = False):
+    """My grade in every course I study, with GPA per term and overall.
+
+    Grades are cached for hours; pass `refresh=True` right after grades are released.
+    """
     token = get_access_token()
-    access_token = token.token
+    payload = await fetch_cached(token, "/get/user/courses", {"detail": 1}, refresh=refresh)
+    data = payload.get("data", payload) if isinstance(payload, dict) else payload
+    # Grades only exist for courses taken as a student, not ones taught or assisted
+    courses = data["student"] if isinstance(data, dict) and isinstance(data.get("student"), list) else records(payload)
+    courses = list({str(c["cv_cid"]): c for c in courses if isinstance(c, dict) and c.get("cv_cid") is not None}.values())
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://www.mycourseville.com/api/v1/public/get/user/gradeletter?cv_cid={courseId}"
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        gradeletter = resp.json()
-        return gradeletter
\ No newline at end of file
+    async def fetch_one(course: dict):
+        async with semaphore:
+            try:
+                return course, await get_user_gradeletter(str(course["cv_cid"]), refresh=refresh), None
+            except Exception as e:
+                return course, None, str(e) or type(e).__name__
+
+    rows, errors = [], []
+    for done, next_result in enumerate(asyncio.as_completed([fetch_one(c) for c in courses]), 1):
+        course, grade, error = await next_result
+        await report_progress(done, len(courses), f"Fetched {course.get('course_no') or course['cv_cid']}")
+        if error is not None:
+            errors.append({**course_summary(course), "error": error})
+            continue
+        letter, credit = _grade(grade)
+        if credit is None:
+            try:
+                credit = float(course.get("credit"))
+            except (TypeError, ValueError):
+                pass
+        rows.append(
+            {
+                **course_summary(course),
+                "year": course.get("year"),
+                "semester": course.get("semester"),
+                "grade": letter,
+                "credit": credit,
+                "points": GRADE_POINTS.get(letter) if letter else None,
+            }
+        )
+
+    rows.sort(key=lambda r: (str(r["year"] or ""), str(r["semester"] or ""), str(r["course_no"] or "")))
+    terms = {}
+    for row in rows:
+        terms.setdefault((row["year"], row["semester"]), []).append(row)
+    gpa, credits = _gpa(rows)
+    return {
+        "gpa": gpa,
+        "graded_credits": credits,
+        "terms": [
+            {"year": year, "semester": semester, "gpa": term_gpa, "graded_credits": term_credits}
+            for (year, semester), term_rows in terms.items()
+            for term_gpa, term_credits in [_gpa(term_rows)]
+        ],
+        "courses": rows,
+        "errors": errors,
+    }
@@ -0,0 +1,72 @@
+"""Let in-flight tool calls finish before the HTTP server shuts down.
+
+Tool results are streamed back over SSE, and sse-starlette closes every SSE
+stream as soon as uvicorn receives SIGTERM/SIGINT, and uvicorn stops
+accepting connections, so uvicorn's own graceful shutdown would still cut off
+calls in progress and the requests that follow them. ``DrainingServer``
+defers uvicorn's exit until ``DrainMiddleware`` reports no calls in flight (or
+the timeout passes); new calls during the drain fail fast so clients can
+retry on another instance. A second signal exits immediately. The lifespan
+also waits for in-flight calls on exit, for servers started another way
+(e.g. the ``uvicorn`` CLI).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import FrameType
+
+import uvicorn
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DrainMiddleware(Middleware):
+    def __init__(self):
+        self.in_flight = 0
+        self.draining = False
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        if self.draining:
+            raise ToolError("Server is shutting down, retry the call")
+        self.in_flight += 1
+        try:
+            return await call_next(context)
+        finally:
+            self.in_flight -= 1
+
+    async def wait_idle(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+
+drain = DrainMiddleware()
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains tool calls before it exits on a signal."""
+
+    def __init__(self, config: uvicorn.Config, drain_timeout: float):
+        super().__init__(config)
+        self.drain_timeout = drain_timeout
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        if drain.draining or not drain.in_flight or self.drain_timeout <= 0:
+            drain.draining = True
+            super().handle_exit(sig, frame)
+            return
+        drain.draining = True
+        logger.info("Waiting up to %ss for %d tool call(s) to finish", self.drain_timeout, drain.in_flight)
+
+        async def exit_when_idle():
+            await drain.wait_idle(self.drain_timeout)
+            super(DrainingServer, self).handle_exit(sig, frame)
+
+        # Called from a signal handler, so schedule the wait on the loop.
+        loop = asyncio.get_event_loop()
+        loop.call_soon_threadsafe(lambda: loop.create_task(exit_when_idle()))
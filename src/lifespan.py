@@ -0,0 +1,33 @@
+"""Server lifespan: the shared HTTP client, the background sync loop and the
+graceful drain of in-flight tool calls."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
+from fastmcp import FastMCP
+
+from clients import mcv
+from config.contants import GRACEFUL_TIMEOUT, SYNC_BACKGROUND
+from drain import drain
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    async with mcv.lifespan(server) as state:
+        task = None
+        if SYNC_BACKGROUND:
+            from sync.engine import sync_engine
+
+            task = asyncio.create_task(sync_engine.run())
+        try:
+            yield state
+        finally:
+            drain.draining = True
+            await drain.wait_idle(GRACEFUL_TIMEOUT)
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
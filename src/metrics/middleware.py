@@ -0,0 +1,52 @@
+"""FastMCP middleware that instruments every tool call."""
+
+from __future__ import annotations
+
+import time
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from metrics.registry import REGISTRY, SIZE_BUCKETS, upstream_time
+
+TOOL_CALLS = REGISTRY.counter(
+    "mcp_tool_calls_total", "Tool calls by tool and outcome.", ("tool", "status")
+)
+TOOL_DURATION = REGISTRY.histogram(
+    "mcp_tool_duration_seconds", "Total tool call latency.", ("tool",)
+)
+TOOL_UPSTREAM = REGISTRY.histogram(
+    "mcp_tool_upstream_seconds",
+    "Time a tool call spent waiting on MyCourseVille.",
+    ("tool",),
+)
+TOOL_RESULT_BYTES = REGISTRY.histogram(
+    "mcp_tool_result_bytes", "Size of tool results.", ("tool",), buckets=SIZE_BUCKETS
+)
+
+
+def _result_size(result) -> int:
+    size = 0
+    for block in getattr(result, "content", None) or []:
+        text = getattr(block, "text", None)
+        if text is not None:
+            size += len(text.encode())
+    return size
+
+
+class ToolMetricsMiddleware(Middleware):
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool = context.message.name
+        spent = [0.0]
+        reset = upstream_time.set(spent)
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            status = "ok"
+            TOOL_RESULT_BYTES.observe(_result_size(result), tool=tool)
+            return result
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - start, tool=tool)
+            TOOL_UPSTREAM.observe(spent[0], tool=tool)
+            TOOL_CALLS.inc(tool=tool, status=status)
+            upstream_time.reset(reset)
@@ -1,6 +1,8 @@
 from fastmcp import FastMCP
-from controllers.admins import get_student_roster
+from controllers.admins import get_roster_changes, get_roster_summary, get_student_roster
 
 
 def register(mcp: FastMCP):
     mcp.tool()(get_student_roster)
+    mcp.tool()(get_roster_summary)
+    mcp.tool()(get_roster_changes)
@@ -8,6 +8,10 @@ from controllers.courses import (
     get_assignment,
     get_playlist,
     get_online_meetings,
+    get_all_assignments,
+    get_all_announcements,
+    get_all_materials,
+    get_all_online_meetings,
 )
 
 
@@ -19,4 +23,8 @@ def register(mcp: FastMCP):
     mcp.tool()(get_course_announcements)
     mcp.tool()(get_assignment)
     mcp.tool()(get_playlist)
-    mcp.tool()(get_online_meetings)
\ No newline at end of file
+    mcp.tool()(get_online_meetings)
+    mcp.tool()(get_all_assignments)
+    mcp.tool()(get_all_announcements)
+    mcp.tool()(get_all_materials)
+    mcp.tool()(get_all_online_meetings)
\ No newline at end of file
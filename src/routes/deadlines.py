@@ -0,0 +1,7 @@
+from fastmcp import FastMCP
+from controllers.deadlines import export_deadlines_ical, get_upcoming_deadlines
+
+
+def register(mcp: FastMCP):
+    mcp.tool()(get_upcoming_deadlines)
+    mcp.tool()(export_deadlines_ical)
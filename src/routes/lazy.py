@@ -0,0 +1,79 @@
+"""Tool registration from precomputed schemas.
+
+Building a tool normally means importing its controller and generating a JSON
+schema from the function signature. For fast cold starts (api/index.py on
+Vercel) tools are instead registered from ``tool_schemas.json`` and the
+controller is imported the first time the tool is called.
+
+Regenerate the schema file after changing a tool signature:
+
+    uv run scripts/build_tool_schemas.py
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+from pathlib import Path
+from typing import Any
+
+from fastmcp import FastMCP
+from fastmcp.tools.tool import FunctionTool, Tool, ToolResult
+from fastmcp.utilities.logging import get_logger
+from pydantic import PrivateAttr
+
+from utils.fastjson import dumps
+
+logger = get_logger(__name__)
+
+SCHEMA_PATH = Path(__file__).with_name("tool_schemas.json")
+
+
+class LazyTool(Tool):
+    """A tool whose implementation is imported on first call."""
+
+    module: str
+    function: str
+    _tool: FunctionTool | None = PrivateAttr(default=None)
+
+    def _resolve(self) -> FunctionTool:
+        if self._tool is None:
+            fn = getattr(importlib.import_module(self.module), self.function)
+            self._tool = FunctionTool.from_function(fn, name=self.name, serializer=dumps)
+            if self._tool.parameters != self.parameters:
+                logger.warning(
+                    "Precomputed schema for %s is stale, run scripts/build_tool_schemas.py",
+                    self.name,
+                )
+        return self._tool
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        return await self._resolve().run(arguments)
+
+
+def register(mcp: FastMCP) -> bool:
+    """Register every tool in ``tool_schemas.json``; False if it is missing."""
+    if not SCHEMA_PATH.exists():
+        return False
+    for spec in json.loads(SCHEMA_PATH.read_text(encoding="utf-8")):
+        mcp.add_tool(LazyTool(**spec))
+    return True
+
+
+async def dump_schemas(mcp: FastMCP) -> list[dict[str, Any]]:
+    """Describe the function tools registered on ``mcp`` for ``register``."""
+    specs = []
+    for tool in (await mcp.get_tools()).values():
+        if not isinstance(tool, FunctionTool):
+            continue
+        specs.append(
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters,
+                "output_schema": tool.output_schema,
+                "module": tool.fn.__module__,
+                "function": tool.fn.__name__,
+            }
+        )
+    return specs
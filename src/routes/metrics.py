@@ -0,0 +1,86 @@
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from fastmcp import FastMCP
+
+from admission import admission
+from cache.response import response_cache
+from cache.warmup import warmup
+from clients import mcv
+from metrics.middleware import ToolMetricsMiddleware
+from metrics.registry import REGISTRY
+
+CACHE_EVENTS = REGISTRY.counter(
+    "mcv_cache_events_total", "Cache lookups by cache and outcome.", ("cache", "outcome")
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "mcv_cache_entries", "Entries held in the in-process cache.", ("cache",)
+)
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "mcv_cache_hit_ratio", "Share of cache lookups answered from cache.", ("cache",)
+)
+UPSTREAM_EVENTS = REGISTRY.counter(
+    "mcv_upstream_events_total", "Upstream requests, coalesced calls, retries and throttles.", ("stat",)
+)
+UPSTREAM = REGISTRY.gauge(
+    "mcv_upstream", "Upstream requests in flight, breaker state and global rate.", ("stat",)
+)
+WARMUP_EVENTS = REGISTRY.counter(
+    "mcv_warmup_events_total", "Post-login prefetch runs and upstream requests.", ("stat",)
+)
+WARMUP = REGISTRY.gauge(
+    "mcv_warmup", "Post-login prefetch runs in progress.", ("stat",)
+)
+ADMISSION_EVENTS = REGISTRY.counter(
+    "mcp_admission_events_total", "Tool calls admitted and shed.", ("stat",)
+)
+ADMISSION = REGISTRY.gauge(
+    "mcp_admission", "Tool calls running and queued, and users with calls in either.", ("stat",)
+)
+
+# Stats that only ever grow; the others are current values.
+TOTALS = frozenset({
+    "hits", "stale_hits", "misses", "coalesced", "requests", "retries",
+    "throttled", "started", "admitted", "rejected",
+})
+
+
+def _record(counter, gauge, stats: dict) -> None:
+    for stat, value in stats.items():
+        (counter if stat in TOTALS else gauge).set(value, stat=stat)
+
+
+def _record_cache(name: str, stats: dict) -> None:
+    for outcome, value in stats.items():
+        if outcome == "size":
+            CACHE_ENTRIES.set(value, cache=name)
+        else:
+            CACHE_EVENTS.set(value, cache=name, outcome=outcome)
+    hits = stats.get("hits", 0) + stats.get("stale_hits", 0)
+    lookups = hits + stats.get("misses", 0)
+    CACHE_HIT_RATIO.set(hits / lookups if lookups else 0, cache=name)
+
+
+def register(mcp: FastMCP):
+    mcp.add_middleware(ToolMetricsMiddleware())
+
+    def collect():
+        _record_cache("response", response_cache.stats())
+        # MCVProvider exposes token_cache; a bare MCVTokenVerifier has cache
+        token_cache = getattr(mcp.auth, "token_cache", None) or getattr(
+            mcp.auth, "cache", None
+        )
+        if token_cache is not None:
+            _record_cache("token", token_cache.stats())
+        upstream = mcv.stats()
+        upstream["breaker_state"] = {"closed": 0, "half-open": 1, "open": 2}[upstream["breaker_state"]]
+        _record(UPSTREAM_EVENTS, UPSTREAM, upstream)
+        _record(WARMUP_EVENTS, WARMUP, warmup.stats())
+        _record(ADMISSION_EVENTS, ADMISSION, admission.stats())
+
+    REGISTRY.on_collect(collect)
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
@@ -0,0 +1,6 @@
+from fastmcp import FastMCP
+from controllers.query import run_query
+
+
+def register(mcp: FastMCP):
+    mcp.tool()(run_query)
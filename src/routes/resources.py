@@ -0,0 +1,80 @@
+import fastmcp
+from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_access_token
+from mcp.server.lowlevel.server import NotificationOptions, request_ctx
+from pydantic import AnyUrl
+
+from cache.response import user_key
+from controllers.resources import (
+    course_announcements,
+    course_assignments,
+    course_info,
+    course_materials,
+    course_playlists,
+    course_syllabus,
+)
+from sync.engine import sync_engine
+from sync.subscriptions import URI_PREFIX, resource_subscriptions
+
+RESOURCES = {
+    "info": course_info,
+    "syllabus": course_syllabus,
+    "materials": course_materials,
+    "assignments": course_assignments,
+    "announcements": course_announcements,
+    "playlists": course_playlists,
+}
+
+
+def register(mcp: FastMCP):
+    for kind, fn in RESOURCES.items():
+        mcp.resource(f"{URI_PREFIX}/{{cv_cid}}/{kind}", mime_type="application/json")(fn)
+
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        token = get_access_token()
+        if token is None:
+            raise ValueError("Subscribing to resources requires authentication")
+        # Keep the user synced so changes are noticed without further calls.
+        sync_engine.track(token)
+        resource_subscriptions.subscribe(user_key(token), str(uri), request_ctx.get().session)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        token = get_access_token()
+        if token is not None:
+            resource_subscriptions.unsubscribe(user_key(token), str(uri), request_ctx.get().session)
+
+    _advertise_subscribe(server)
+
+
+def _advertise_subscribe(server) -> None:
+    """Advertise ``resources.subscribe``, which the MCP SDK hard-codes to False.
+
+    Neither FastMCP nor the SDK has an option for it, so the low-level
+    server's ``get_capabilities`` is wrapped. The result is checked here so a
+    FastMCP or SDK upgrade that changes either fails at startup instead of
+    silently dropping the capability.
+    """
+    get_capabilities = getattr(server, "get_capabilities", None)
+    if not callable(get_capabilities):
+        raise RuntimeError(
+            f"FastMCP {fastmcp.__version__}: low-level server has no get_capabilities; "
+            "update routes/resources.py to advertise resource subscriptions"
+        )
+
+    def capabilities(*args, **kwargs):
+        caps = get_capabilities(*args, **kwargs)
+        if caps.resources is not None:
+            caps.resources.subscribe = True
+        return caps
+
+    server.get_capabilities = capabilities
+    caps = server.get_capabilities(NotificationOptions(), {})
+    if caps.resources is None or not caps.resources.subscribe:
+        raise RuntimeError(
+            f"FastMCP {fastmcp.__version__}: resource subscriptions are not advertised; "
+            "update routes/resources.py"
+        )
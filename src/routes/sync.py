@@ -0,0 +1,7 @@
+from fastmcp import FastMCP
+from controllers.sync import get_changes_since, search_course_content
+
+
+def register(mcp: FastMCP):
+    mcp.tool()(get_changes_since)
+    mcp.tool()(search_course_content)
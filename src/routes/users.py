@@ -1,7 +1,8 @@
 from fastmcp import FastMCP
-from controllers.users import get_me, get_user_gradeletter
+from controllers.users import get_all_gradeletters, get_me, get_user_gradeletter
 
 
 def register(mcp: FastMCP):
     mcp.tool()(get_me)
-    mcp.tool()(get_user_gradeletter)
\ No newline at end of file
+    mcp.tool()(get_user_gradeletter)
+    mcp.tool()(get_all_gradeletters)
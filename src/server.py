@@ -1,41 +1,114 @@
 from fastmcp import FastMCP
+from fastmcp.utilities.logging import get_logger
 
-from auth.mcv import MCVProvider
+from auth.mcv import MCVProvider, MCVTokenVerifier
+from auth.token_cache import TokenCache
+from cache.response import response_cache
+from cache.warmup import warmup
+from admission import admission
 from config.contants import (
+    ADMISSION_ENABLED,
     APP_NAME,
+    AUTH_MODE,
+    GRACEFUL_TIMEOUT,
     HOST,
     MCV_CLIENT_ID,
     MCV_CLIENT_SECRET,
     MCV_REDIRECT_PATH,
     PORT,
+    RESPONSE_CACHE_SHARED,
+    STATELESS_HTTP,
+    STORAGE_BACKEND,
+    TOOL_STRUCTURED_CONTENT,
     TRANSPORT,
+    WORKERS,
 )
-from routes import admins, courses, root, users
-
-auth = MCVProvider(
-    client_id=MCV_CLIENT_ID,
-    client_secret=MCV_CLIENT_SECRET,
-    # client_storage = FernetEncryptionWrapper(
-    #     key_value=RedisStore(host="localhost", port=6379),
-    #     fernet=Fernet(key)
-    # ),
-    client_storage=None,
-    base_url="http://localhost:8000",
-    redirect_path=MCV_REDIRECT_PATH,
-    allowed_client_redirect_uris=[
-        "http://localhost:*",
-        "http://127.0.0.1:*",
-        "https://claude.ai/api/mcp/auth_callback",
-    ],
-)
+from drain import DrainingServer, drain
+from lifespan import lifespan
+from routes import admins, courses, deadlines, metrics, query, resources, root, sync, users
+from storage.factory import create_storage
+from transport import ResultMiddleware, http_middleware
+from utils.fastjson import dumps
+
+storage = create_storage()
+if RESPONSE_CACHE_SHARED:
+    response_cache.storage = storage
+
+if AUTH_MODE == "token":
+    auth = MCVTokenVerifier(cache=TokenCache(storage=storage))
+else:
+    auth = MCVProvider(
+        client_id=MCV_CLIENT_ID,
+        client_secret=MCV_CLIENT_SECRET,
+        client_storage=storage,
+        base_url="http://localhost:8000",
+        redirect_path=MCV_REDIRECT_PATH,
+        allowed_client_redirect_uris=[
+            "http://localhost:*",
+            "http://127.0.0.1:*",
+            "https://claude.ai/api/mcp/auth_callback",
+        ],
+    )
 
-mcp = FastMCP(APP_NAME, auth=auth)
+warmup.attach(auth)
+
+# Same output as the default serializer unless orjson (fast-json extra) is installed
+mcp = FastMCP(APP_NAME, auth=auth, lifespan=lifespan, tool_serializer=dumps)
+mcp.add_middleware(drain)
+if ADMISSION_ENABLED:
+    mcp.add_middleware(admission)
+mcp.add_middleware(ResultMiddleware(TOOL_STRUCTURED_CONTENT))
 
 root.register(mcp)
+metrics.register(mcp)
 users.register(mcp)
 courses.register(mcp)
 admins.register(mcp)
+sync.register(mcp)
+deadlines.register(mcp)
+query.register(mcp)
+resources.register(mcp)
+
+logger = get_logger(__name__)
+
+
+def serve_http() -> None:
+    """Serve the streamable-HTTP app from ``WORKERS`` uvicorn processes.
+
+    Each of several workers imports ``asgi:app``; OAuth state and verified
+    tokens are shared through the storage backend, so it must not be
+    ``memory``. Every worker drains in-flight tool calls on SIGTERM.
+    """
+    import uvicorn
+    from uvicorn.supervisors import Multiprocess
+
+    if WORKERS <= 1:
+        app = mcp.http_app(transport=TRANSPORT, stateless_http=STATELESS_HTTP, middleware=http_middleware())
+        config = uvicorn.Config(
+            app, host=HOST, port=PORT, timeout_graceful_shutdown=GRACEFUL_TIMEOUT, lifespan="on"
+        )
+        DrainingServer(config, GRACEFUL_TIMEOUT).run()
+        return
+
+    if STORAGE_BACKEND == "memory":
+        logger.warning("STORAGE_BACKEND=memory is per process; use disk or redis with WORKERS > 1")
+    if not STATELESS_HTTP:
+        logger.warning("STATELESS_HTTP=false with WORKERS > 1: sessions break when requests reach another worker")
+    config = uvicorn.Config(
+        "asgi:app",
+        host=HOST,
+        port=PORT,
+        workers=WORKERS,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        lifespan="on",
+    )
+    server = DrainingServer(config, GRACEFUL_TIMEOUT)
+    Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+
 
 if __name__ == "__main__":
     print(f"🚀 Starting {APP_NAME} on {TRANSPORT}://{HOST}:{PORT}")
-    mcp.run(transport=TRANSPORT, host=HOST, port=PORT)
+    if TRANSPORT == "stdio":
+        mcp.run(transport=TRANSPORT)
+    else:
+        serve_http()
@@ -0,0 +1,93 @@
+"""Storage for OAuth client registrations, tokens and shared caches.
+
+The configured backend (SQLite on disk, Redis, or memory) is encrypted with
+Fernet and fronted by an in-process LRU, so hot lookups such as token
+verification stay in memory while writes and deletes go straight to the
+shared backend. Local entries expire after ``STORAGE_LOCAL_CACHE_TTL``
+seconds, which bounds how long a worker can serve a value another worker has
+since changed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+from fastmcp import settings as fastmcp_settings
+from fastmcp.server.auth.jwt_issuer import derive_jwt_key
+from fastmcp.utilities.logging import get_logger
+from key_value.aio.protocols import AsyncKeyValue
+from key_value.aio.stores.memory import MemoryStore
+from key_value.aio.wrappers.encryption import FernetEncryptionWrapper
+from key_value.aio.wrappers.passthrough_cache import PassthroughCacheWrapper
+
+from config.contants import (
+    MCV_CLIENT_SECRET,
+    PUBLIC_CLIENT_SECRET,
+    STORAGE_BACKEND,
+    STORAGE_DISK_PATH,
+    STORAGE_ENCRYPTION_KEY,
+    STORAGE_LOCAL_CACHE_SIZE,
+    STORAGE_LOCAL_CACHE_TTL,
+    STORAGE_REDIS_URL,
+)
+
+logger = get_logger(__name__)
+
+
+def _backend() -> AsyncKeyValue:
+    if STORAGE_BACKEND == "disk":
+        from key_value.aio.stores.disk import DiskStore
+
+        directory = (
+            Path(STORAGE_DISK_PATH)
+            if STORAGE_DISK_PATH
+            else fastmcp_settings.home / "mcv-mcp-server"
+        )
+        return DiskStore(directory=directory)
+    if STORAGE_BACKEND == "redis":
+        # Requires the redis extra: uv sync --extra redis
+        from key_value.aio.stores.redis import RedisStore
+
+        return RedisStore(url=STORAGE_REDIS_URL)
+    if STORAGE_BACKEND == "memory":
+        return MemoryStore()
+    raise ValueError(
+        f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}, expected disk, redis or memory"
+    )
+
+
+def _encrypted(store: AsyncKeyValue) -> AsyncKeyValue:
+    if STORAGE_ENCRYPTION_KEY:
+        return FernetEncryptionWrapper(
+            key_value=store,
+            fernet=Fernet(STORAGE_ENCRYPTION_KEY),
+            raise_on_decryption_error=False,
+        )
+    if STORAGE_BACKEND != "memory" and MCV_CLIENT_SECRET in ("", PUBLIC_CLIENT_SECRET):
+        # A key derived from the public fallback protects nothing at rest.
+        raise ValueError(
+            f"STORAGE_BACKEND={STORAGE_BACKEND} needs STORAGE_ENCRYPTION_KEY or a real "
+            "MCV_CLIENT_SECRET to encrypt stored tokens"
+        )
+    # The client secret is high-entropy, so HKDF is enough; PBKDF2 would add
+    # a few hundred milliseconds to every cold start.
+    key = derive_jwt_key(
+        high_entropy_material=MCV_CLIENT_SECRET, salt="mcv-mcp-server-storage"
+    )
+    return FernetEncryptionWrapper(
+        key_value=store,
+        fernet=Fernet(key),
+        raise_on_decryption_error=False,
+    )
+
+
+def create_storage() -> AsyncKeyValue:
+    """Build the configured two-tier, encrypted store."""
+    logger.debug("Using %s storage backend", STORAGE_BACKEND)
+    return PassthroughCacheWrapper(
+        primary_key_value=_encrypted(_backend()),
+        cache_key_value=MemoryStore(max_entries_per_collection=STORAGE_LOCAL_CACHE_SIZE),
+        maximum_ttl=STORAGE_LOCAL_CACHE_TTL,
+        missing_ttl=STORAGE_LOCAL_CACHE_TTL,
+    )
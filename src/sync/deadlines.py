@@ -0,0 +1,144 @@
+"""Per-user due-date index over the assignments in the sync store.
+
+Each user's assignments are kept as one due-date sorted list per course,
+merged into a single sorted list that ``upcoming`` slices with ``bisect``.
+Each query compares the store's per-course list hashes with the ones the index
+was built from and reloads only the courses whose assignment list changed, so
+it never re-reads or re-sorts every course, and it also sees syncs made by
+other worker processes sharing the store. Indexes of users who have not asked
+for a while are dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from cache.memory import TTLCache
+from config.contants import DEADLINE_INDEX_SIZE, SYNC_ACTIVE_WINDOW
+from sync.engine import SyncEngine, sync_engine
+from utils.payload import timestamp
+
+DUE_FIELDS = ("duetime", "duedate")
+
+
+class Deadline(NamedTuple):
+    due: float
+    cv_cid: str
+    item_id: str
+    title: str
+
+
+class _UserIndex:
+    def __init__(self):
+        self.courses: dict[str, list[Deadline]] = {}
+        self.hashes: dict[str, str] = {}
+        self.merged: list[Deadline] = []
+
+
+class DeadlineIndex:
+    def __init__(self, engine: SyncEngine, *, maxsize: int = 1000, ttl: float = 1800):
+        self.engine = engine
+        self._users = TTLCache(maxsize, ttl)
+        self._lock = asyncio.Lock()
+
+    def _load(self, user_id: str, cv_cids: set[str] | None) -> dict[str, list[Deadline]]:
+        """Read assignments from the store, grouped by course and sorted by due time."""
+        store = self.engine.store
+        rows = (
+            store.items(user_id, "assignments")
+            if cv_cids is None
+            else [row for cv_cid in cv_cids for row in store.items(user_id, "assignments", cv_cid)]
+        )
+        courses: dict[str, list[Deadline]] = {cv_cid: [] for cv_cid in cv_cids or ()}
+        for row in rows:
+            due = timestamp(row["item"], *DUE_FIELDS)
+            if due is None:
+                continue
+            courses.setdefault(row["cv_cid"], []).append(
+                Deadline(due, row["cv_cid"], row["item_id"], str(row["item"].get("title") or ""))
+            )
+        for deadlines in courses.values():
+            deadlines.sort()
+        return courses
+
+    async def _index(self, user_id: str) -> _UserIndex:
+        async with self._lock:
+            hashes = await asyncio.to_thread(self.engine.store.list_hashes, user_id, "assignments")
+            index = self._users.get(user_id) or _UserIndex()
+            if hashes == index.hashes:
+                self._users.set(user_id, index)
+                return index
+            changed = {cv_cid for cv_cid, h in hashes.items() if index.hashes.get(cv_cid) != h}
+            courses = {c: d for c, d in index.courses.items() if c in hashes}
+            courses.update(await asyncio.to_thread(self._load, user_id, changed if index.hashes else None))
+            index.courses = {c: d for c, d in courses.items() if d}
+            index.hashes = hashes
+            index.merged = list(heapq.merge(*index.courses.values()))
+            self._users.set(user_id, index)
+            return index
+
+    async def upcoming(self, user_id: str, start: float, end: float) -> list[Deadline]:
+        merged = (await self._index(user_id)).merged
+        return merged[bisect_left(merged, (start,)) : bisect_right(merged, (end, "\uffff"))]
+
+
+deadline_index = DeadlineIndex(sync_engine, maxsize=DEADLINE_INDEX_SIZE, ttl=SYNC_ACTIVE_WINDOW)
+
+
+def _ical_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _ical_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line: str) -> str:
+    # RFC 5545: lines longer than 75 octets continue on lines starting with a space
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1  # do not split a UTF-8 sequence
+        parts.append(raw[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
+
+
+def to_ical(deadlines: list[Deadline], courses: dict[str, dict], now: float) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//mcv-mcp-server//deadlines//EN",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:MyCourseVille deadlines",
+    ]
+    for d in deadlines:
+        course = courses.get(d.cv_cid, {})
+        prefix = course.get("course_no") or course.get("title") or d.cv_cid
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:mcv-assignment-{d.item_id}@mycourseville.com",
+            f"DTSTAMP:{_ical_time(now)}",
+            f"DTSTART:{_ical_time(d.due)}",
+            f"DTEND:{_ical_time(d.due)}",
+            f"SUMMARY:{_ical_text(f'{prefix}: {d.title}')}",
+            f"DESCRIPTION:{_ical_text(str(course.get('title') or ''))}",
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            "TRIGGER:-PT24H",
+            f"DESCRIPTION:{_ical_text(d.title)}",
+            "END:VALARM",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
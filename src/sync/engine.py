@@ -0,0 +1,190 @@
+"""Background sync of each user's courses into the local index.
+
+A sync pulls the course list and, for every course, the assignment,
+announcement and material lists, then hands them to ``SyncStore`` which only
+rewrites lists whose content hash changed. Lists are read through the response
+cache, so a scheduled sync only reaches MyCourseVille for entries past their
+TTL; only an explicit ``refresh`` bypasses it. Users who used an index-backed tool
+recently are re-synced in the background every ``SYNC_INTERVAL`` seconds, so
+"what's new" questions are answered from SQLite instead of MyCourseVille.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Callable
+
+import httpx
+from fastmcp import settings as fastmcp_settings
+from fastmcp.server.auth.auth import AccessToken
+from fastmcp.utilities.logging import get_logger
+
+from cache.response import fetch_cached, user_key
+from cache.singleflight import SingleFlight
+from config.contants import (
+    FANOUT_CONCURRENCY,
+    SYNC_ACTIVE_WINDOW,
+    SYNC_DB_PATH,
+    SYNC_INTERVAL,
+)
+from sync.store import SyncStore
+from utils.payload import records, timestamp
+
+logger = get_logger(__name__)
+
+# kind -> (endpoint, fields holding the item's own creation time)
+KINDS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "assignments": ("/get/course/assignments", ("created", "createdtime")),
+    "announcements": ("/get/course/announcements", ("createdtime", "created")),
+    "materials": ("/get/course/materials", ("created", "createdtime")),
+}
+
+
+class SyncEngine:
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        interval: float = 300,
+        active_window: float = 1800,
+        concurrency: int = 8,
+    ):
+        self.path = path
+        self.interval = interval
+        self.active_window = active_window
+        self.concurrency = concurrency
+        self._store: SyncStore | None = None
+        self._tokens: dict[str, tuple[AccessToken, float]] = {}
+        self._flight = SingleFlight()
+        self._background: set[asyncio.Task] = set()
+        # Called with (user_id, summary) after every sync, e.g. to invalidate
+        # indexes derived from the store.
+        self.listeners: list[Callable[[str, dict], None]] = []
+
+    @property
+    def store(self) -> SyncStore:
+        # Opened on first use so importing the module stays cheap.
+        if self._store is None:
+            self._store = SyncStore(self.path)
+        return self._store
+
+    def track(self, token: AccessToken) -> None:
+        """Remember ``token`` so the background loop can keep its user synced."""
+        self._tokens[user_key(token)] = (token, time.time())
+
+    async def sync_user(self, token: AccessToken, refresh: bool = False) -> dict:
+        """Sync ``token``'s user; ``refresh`` skips the response cache."""
+        user_id = user_key(token)
+        # A refresh must not join a sync that reads the cache.
+        return await self._flight.do(
+            (user_id, refresh), lambda: self._sync(user_id, token, refresh)
+        )
+
+    async def ensure_synced(self, token: AccessToken, refresh: bool = False) -> dict | None:
+        """Sync now if the user was never synced (or ``refresh``), else in the background when stale."""
+        self.track(token)
+        last = await asyncio.to_thread(self.store.last_synced, user_key(token))
+        if refresh or last is None:
+            return await self.sync_user(token, refresh=refresh)
+        if time.time() - last >= self.interval:
+            task = asyncio.ensure_future(self.sync_user(token))
+            self._background.add(task)
+            task.add_done_callback(self._synced)
+        return None
+
+    def _synced(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Background sync failed: %s", task.exception())
+
+    async def _sync(self, user_id: str, token: AccessToken, refresh: bool) -> dict:
+        now = time.time()
+        payload = await fetch_cached(token, "/get/user/courses", {"detail": 1}, refresh=refresh)
+        courses = {
+            str(c["cv_cid"]): c
+            for c in records(payload)
+            if isinstance(c, dict) and c.get("cv_cid") is not None
+        }
+        dropped = await asyncio.to_thread(self.store.save_courses, user_id, list(courses.values()), now)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def sync_list(cv_cid: str, kind: str):
+            path, created_fields = KINDS[kind]
+            async with semaphore:
+                try:
+                    data = await fetch_cached(
+                        token,
+                        path,
+                        {"cv_cid": cv_cid, "detail": 1, "published": 1},
+                        refresh=refresh,
+                    )
+                except Exception as e:
+                    return cv_cid, kind, None, str(e) or type(e).__name__
+            items = [item for item in records(data) if isinstance(item, dict)]
+            counts = await asyncio.to_thread(
+                self.store.apply_list,
+                user_id,
+                cv_cid,
+                kind,
+                items,
+                now,
+                lambda item: timestamp(item, *created_fields),
+            )
+            return cv_cid, kind, counts, None
+
+        results = await asyncio.gather(
+            *(sync_list(cv_cid, kind) for cv_cid in courses for kind in KINDS)
+        )
+
+        summary = {"courses": len(courses), "added": 0, "updated": 0, "deleted": 0, "changed": [], "errors": []}
+        for course_list in dropped:
+            summary["deleted"] += course_list["deleted"]
+            summary["changed"].append({**course_list, "added": 0, "updated": 0})
+        for cv_cid, kind, counts, error in results:
+            if error is not None:
+                summary["errors"].append({"cv_cid": cv_cid, "kind": kind, "error": error})
+                continue
+            for change, count in counts.items():
+                summary[change] += count
+            if any(counts.values()):
+                summary["changed"].append({"cv_cid": cv_cid, "kind": kind, **counts})
+        await asyncio.to_thread(self.store.mark_synced, user_id, now)
+        logger.debug("Synced user %s: %s", user_id, summary)
+        for listener in self.listeners:
+            try:
+                listener(user_id, summary)
+            except Exception as e:
+                logger.warning("Sync listener %r failed: %s", listener, e)
+        return summary
+
+    async def run(self) -> None:
+        """Keep recently active users synced; runs for the server's lifetime."""
+        while True:
+            await asyncio.sleep(min(60, self.interval))
+            now = time.time()
+            for user_id, (token, seen) in list(self._tokens.items()):
+                if now - seen > self.active_window:
+                    del self._tokens[user_id]
+                    continue
+                last = await asyncio.to_thread(self.store.last_synced, user_id)
+                if last is not None and now - last < self.interval:
+                    continue
+                try:
+                    await self.sync_user(token)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code in (401, 403):
+                        self._tokens.pop(user_id, None)
+                    logger.debug("Background sync for %s failed: %s", user_id, e)
+                except Exception as e:
+                    logger.debug("Background sync for %s failed: %s", user_id, e)
+
+
+sync_engine = SyncEngine(
+    SYNC_DB_PATH or fastmcp_settings.home / "mcv-mcp-server" / "sync.sqlite3",
+    interval=SYNC_INTERVAL,
+    active_window=SYNC_ACTIVE_WINDOW,
+    concurrency=FANOUT_CONCURRENCY,
+)
@@ -0,0 +1,446 @@
+"""SQLite snapshot of each user's courses and course items.
+
+Every item (assignment, announcement, material) is stored per course with a
+content hash and the time the sync engine last saw it change or disappear, so
+"what's new since X" is a single indexed query. A hash of each course list
+lets unchanged lists be skipped without touching their items. Items of
+courses that drop out of the user's course list are marked deleted.
+
+Live items are also kept in an FTS5 table for ``search``. The trigram
+tokenizer is used because Thai is written without spaces between words, so
+word tokenizers index whole sentences as one token; trigrams match any
+substring of three or more characters in Thai and English alike.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+from utils.projection import strip_html
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS courses (
+    user_id TEXT NOT NULL,
+    cv_cid TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, cv_cid)
+);
+CREATE TABLE IF NOT EXISTS lists (
+    user_id TEXT NOT NULL,
+    cv_cid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (user_id, cv_cid, kind)
+);
+CREATE TABLE IF NOT EXISTS items (
+    user_id TEXT NOT NULL,
+    cv_cid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    deleted_at REAL,
+    PRIMARY KEY (user_id, cv_cid, kind, item_id)
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    user_id TEXT NOT NULL,
+    cv_cid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, cv_cid, kind)
+);
+CREATE INDEX IF NOT EXISTS items_changed ON items (user_id, changed_at);
+CREATE INDEX IF NOT EXISTS items_deleted ON items (user_id, deleted_at);
+"""
+
+# rowid matches items.rowid; user_id and kind are filtered on, not searched.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    user_id UNINDEXED, kind UNINDEXED, title, body, tokenize = '{tokenizer}'
+)
+"""
+
+TITLE_FIELDS = ("title", "name", "filename")
+_URL = re.compile(r"^\w+://")
+
+
+def content_hash(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def item_id(item: dict) -> str:
+    for field in ("itemid", "item_id", "id"):
+        if item.get(field) is not None:
+            return str(item[field])
+    return content_hash(item)[:16]
+
+
+def search_text(item: dict) -> tuple[str, str]:
+    """(title, body) to index: the title field, then every other text field."""
+    title = next((str(item[f]) for f in TITLE_FIELDS if item.get(f)), "")
+    body = " ".join(
+        strip_html(value) if "<" in value else value
+        for key, value in item.items()
+        if isinstance(value, str) and key not in TITLE_FIELDS and value and not _URL.match(value)
+    )
+    return title, body
+
+
+def fts_query(query: str, any_term: bool = False) -> str | None:
+    """FTS5 MATCH expression for ``query``: every term quoted, AND-ed (or OR-ed).
+
+    Trigram indexes cannot match terms shorter than three characters, so
+    those are dropped; ``None`` means nothing searchable is left.
+    """
+    terms = [t for t in query.split() if len(t) >= 3]
+    if not terms:
+        return None
+    quoted = ['"' + t.replace('"', '""') + '"' for t in terms]
+    return (" OR " if any_term else " ").join(quoted)
+
+
+class SyncStore:
+    """Thread-safe wrapper around one SQLite connection.
+
+    Methods are synchronous; the engine calls them with ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str | Path):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.execute(FTS_SCHEMA.format(tokenizer="trigram"))
+            except sqlite3.OperationalError:
+                # SQLite < 3.34 has no trigram tokenizer
+                self._conn.execute(FTS_SCHEMA.format(tokenizer="unicode61"))
+            if self._conn.execute("SELECT 1 FROM items_fts LIMIT 1").fetchone() is None:
+                self._reindex()
+
+    def _reindex(self) -> None:
+        rows = self._conn.execute(
+            "SELECT rowid, user_id, kind, data FROM items WHERE deleted_at IS NULL"
+        ).fetchall()
+        self._conn.executemany(
+            "INSERT INTO items_fts (rowid, user_id, kind, title, body) VALUES (?, ?, ?, ?, ?)",
+            [
+                (row["rowid"], row["user_id"], row["kind"], *search_text(json.loads(row["data"])))
+                for row in rows
+            ],
+        )
+
+    def _index(self, user_id: str, cv_cid: str, kind: str, iid: str, item: dict | None) -> None:
+        row = self._conn.execute(
+            "SELECT rowid FROM items WHERE user_id = ? AND cv_cid = ? AND kind = ? AND item_id = ?",
+            (user_id, cv_cid, kind, iid),
+        ).fetchone()
+        self._conn.execute("DELETE FROM items_fts WHERE rowid = ?", (row["rowid"],))
+        if item is not None:
+            self._conn.execute(
+                "INSERT INTO items_fts (rowid, user_id, kind, title, body) VALUES (?, ?, ?, ?, ?)",
+                (row["rowid"], user_id, kind, *search_text(item)),
+            )
+
+    def last_synced(self, user_id: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return row["synced_at"] if row else None
+
+    def mark_synced(self, user_id: str, synced_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO users (user_id, synced_at) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET synced_at = excluded.synced_at",
+                (user_id, synced_at),
+            )
+
+    def save_courses(self, user_id: str, courses: list[dict], now: float) -> list[dict]:
+        """Store the user's course list and mark items of courses no longer in it deleted.
+
+        Returns ``{"cv_cid", "kind", "deleted"}`` per course list that was dropped.
+        """
+        cv_cids = {str(c["cv_cid"]) for c in courses}
+        dropped = []
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM courses WHERE user_id = ?", (user_id,))
+            self._conn.executemany(
+                "INSERT INTO courses (user_id, cv_cid, data) VALUES (?, ?, ?)",
+                [
+                    (user_id, str(c["cv_cid"]), json.dumps(c, ensure_ascii=False))
+                    for c in courses
+                ],
+            )
+            # An empty list is more likely an upstream hiccup than leaving
+            # every course, so it keeps the index as it is.
+            if not cv_cids:
+                return dropped
+            for row in self._conn.execute(
+                "SELECT cv_cid, kind FROM lists WHERE user_id = ?", (user_id,)
+            ).fetchall():
+                if row["cv_cid"] in cv_cids:
+                    continue
+                cv_cid, kind = row["cv_cid"], row["kind"]
+                live = self._conn.execute(
+                    "SELECT item_id FROM items "
+                    "WHERE user_id = ? AND cv_cid = ? AND kind = ? AND deleted_at IS NULL",
+                    (user_id, cv_cid, kind),
+                ).fetchall()
+                for item in live:
+                    self._index(user_id, cv_cid, kind, item["item_id"], None)
+                self._conn.execute(
+                    "UPDATE items SET deleted_at = ? "
+                    "WHERE user_id = ? AND cv_cid = ? AND kind = ? AND deleted_at IS NULL",
+                    (now, user_id, cv_cid, kind),
+                )
+                self._conn.execute(
+                    "DELETE FROM lists WHERE user_id = ? AND cv_cid = ? AND kind = ?",
+                    (user_id, cv_cid, kind),
+                )
+                dropped.append({"cv_cid": cv_cid, "kind": kind, "deleted": len(live)})
+        return dropped
+
+    def courses(self, user_id: str) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cv_cid, data FROM courses WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        return {row["cv_cid"]: json.loads(row["data"]) for row in rows}
+
+    def list_hashes(self, user_id: str, kind: str) -> dict[str, str]:
+        """Content hash of each stored course list of one kind, by course."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cv_cid, content_hash FROM lists WHERE user_id = ? AND kind = ?",
+                (user_id, kind),
+            ).fetchall()
+        return {row["cv_cid"]: row["content_hash"] for row in rows}
+
+    def apply_list(
+        self,
+        user_id: str,
+        cv_cid: str,
+        kind: str,
+        items: list[dict],
+        now: float,
+        first_seen_at=None,
+    ) -> dict[str, int]:
+        """Store the latest ``items`` of one course list and record changes.
+
+        New and modified items get ``changed_at = now``; items that vanished get
+        ``deleted_at = now``. The first time a list is seen, ``first_seen_at``
+        (item -> timestamp or None) dates items by their own creation time so
+        the initial import does not look like a burst of changes.
+        """
+        list_hash = content_hash(items)
+        counts = {"added": 0, "updated": 0, "deleted": 0}
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content_hash FROM lists WHERE user_id = ? AND cv_cid = ? AND kind = ?",
+                (user_id, cv_cid, kind),
+            ).fetchone()
+            initial = row is None
+            if row is not None and row["content_hash"] == list_hash:
+                self._conn.execute(
+                    "UPDATE lists SET synced_at = ? WHERE user_id = ? AND cv_cid = ? AND kind = ?",
+                    (now, user_id, cv_cid, kind),
+                )
+                return counts
+
+            existing = {
+                r["item_id"]: (r["content_hash"], r["deleted_at"])
+                for r in self._conn.execute(
+                    "SELECT item_id, content_hash, deleted_at FROM items "
+                    "WHERE user_id = ? AND cv_cid = ? AND kind = ?",
+                    (user_id, cv_cid, kind),
+                )
+            }
+            seen = set()
+            for item in items:
+                iid = item_id(item)
+                seen.add(iid)
+                h = content_hash(item)
+                previous = existing.get(iid)
+                if previous is not None and previous[0] == h and previous[1] is None:
+                    continue
+                changed_at = now
+                if previous is None:
+                    counts["added"] += 1
+                    if initial and first_seen_at is not None:
+                        changed_at = first_seen_at(item) or now
+                else:
+                    counts["updated"] += 1
+                self._conn.execute(
+                    "INSERT INTO items (user_id, cv_cid, kind, item_id, content_hash, data, created_at, changed_at, deleted_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL) "
+                    "ON CONFLICT (user_id, cv_cid, kind, item_id) DO UPDATE SET "
+                    "content_hash = excluded.content_hash, "
+                    "data = excluded.data, changed_at = excluded.changed_at, deleted_at = NULL",
+                    (user_id, cv_cid, kind, iid, h, json.dumps(item, ensure_ascii=False), changed_at, changed_at),
+                )
+                self._index(user_id, cv_cid, kind, iid, item)
+            for iid, (_, deleted_at) in existing.items():
+                if iid not in seen and deleted_at is None:
+                    counts["deleted"] += 1
+                    self._conn.execute(
+                        "UPDATE items SET deleted_at = ? "
+                        "WHERE user_id = ? AND cv_cid = ? AND kind = ? AND item_id = ?",
+                        (now, user_id, cv_cid, kind, iid),
+                    )
+                    self._index(user_id, cv_cid, kind, iid, None)
+            self._conn.execute(
+                "INSERT INTO lists (user_id, cv_cid, kind, content_hash, synced_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, cv_cid, kind) DO UPDATE SET "
+                "content_hash = excluded.content_hash, synced_at = excluded.synced_at",
+                (user_id, cv_cid, kind, list_hash, now),
+            )
+        return counts
+
+    def changes_since(
+        self,
+        user_id: str,
+        since: float,
+        kinds: list[str] | None = None,
+        cv_cid: str | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Items added, updated or deleted after ``since``, newest first."""
+        sql = (
+            "SELECT cv_cid, kind, item_id, data, created_at, changed_at, deleted_at FROM items "
+            "WHERE user_id = ? AND (changed_at > ? OR deleted_at > ?)"
+        )
+        params: list[Any] = [user_id, since, since]
+        if kinds:
+            sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        if cv_cid is not None:
+            sql += " AND cv_cid = ?"
+            params.append(str(cv_cid))
+        sql += " ORDER BY MAX(changed_at, COALESCE(deleted_at, 0)) DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "cv_cid": row["cv_cid"],
+                "kind": row["kind"],
+                "item_id": row["item_id"],
+                "item": json.loads(row["data"]),
+                "created_at": row["created_at"],
+                "changed_at": row["changed_at"],
+                "deleted_at": row["deleted_at"],
+            }
+            for row in rows
+        ]
+
+    def items(
+        self, user_id: str, kind: str, cv_cid: str | None = None
+    ) -> list[dict]:
+        """Current (not deleted) items of one kind."""
+        sql = "SELECT cv_cid, item_id, data FROM items WHERE user_id = ? AND kind = ? AND deleted_at IS NULL"
+        params: list[Any] = [user_id, kind]
+        if cv_cid is not None:
+            sql += " AND cv_cid = ?"
+            params.append(str(cv_cid))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"cv_cid": row["cv_cid"], "item_id": row["item_id"], "item": json.loads(row["data"])}
+            for row in rows
+        ]
+
+    def search(
+        self,
+        user_id: str,
+        query: str,
+        kinds: list[str] | None = None,
+        cv_cid: str | None = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        """Live items matching ``query``, best first, with a highlighted snippet.
+
+        All terms must match; when nothing does, any term may.
+        """
+        for any_term in (False, True):
+            match = fts_query(query, any_term)
+            if match is None:
+                return []
+            sql = (
+                "SELECT i.cv_cid, i.kind, i.item_id, i.data, "
+                "snippet(items_fts, -1, '**', '**', '…', 48) AS snippet, "
+                "bm25(items_fts, 0, 0, 5.0, 1.0) AS score "
+                "FROM items_fts JOIN items i ON i.rowid = items_fts.rowid "
+                "WHERE items_fts MATCH ? AND items_fts.user_id = ?"
+            )
+            params: list[Any] = [match, user_id]
+            if kinds:
+                sql += f" AND items_fts.kind IN ({','.join('?' * len(kinds))})"
+                params.extend(kinds)
+            if cv_cid is not None:
+                sql += " AND i.cv_cid = ?"
+                params.append(str(cv_cid))
+            sql += " ORDER BY score LIMIT ?"
+            params.append(limit)
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            if rows or len(query.split()) < 2:
+                break
+        return [
+            {
+                "cv_cid": row["cv_cid"],
+                "kind": row["kind"],
+                "item_id": row["item_id"],
+                "item": json.loads(row["data"]),
+                "snippet": row["snippet"],
+                "score": -row["score"],
+            }
+            for row in rows
+        ]
+
+    def save_snapshot(self, user_id: str, cv_cid: str, kind: str, data: Any, taken_at: float) -> bool:
+        """Replace the snapshot of ``data``; skipped (returns False) if it is unchanged."""
+        h = content_hash(data)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content_hash FROM snapshots WHERE user_id = ? AND cv_cid = ? AND kind = ?",
+                (user_id, str(cv_cid), kind),
+            ).fetchone()
+            if row is not None and row["content_hash"] == h:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (user_id, cv_cid, kind, taken_at, content_hash, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, str(cv_cid), kind, taken_at, h, json.dumps(data, ensure_ascii=False)),
+            )
+        return True
+
+    def snapshot(self, user_id: str, cv_cid: str, kind: str) -> tuple[float, Any] | None:
+        """The saved snapshot, as (taken_at, data)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT taken_at, data FROM snapshots WHERE user_id = ? AND cv_cid = ? AND kind = ?",
+                (user_id, str(cv_cid), kind),
+            ).fetchone()
+        return (row["taken_at"], json.loads(row["data"])) if row else None
@@ -0,0 +1,60 @@
+"""Resource subscriptions and ``notifications/resources/updated``.
+
+Clients subscribe to ``mcv://course/{cv_cid}/{kind}`` URIs. Subscribing also
+enrolls the user in background sync; when a sync finds that one of the
+user's course lists changed, every session of that user subscribed to the
+matching URI is notified and can re-read just that resource.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+
+from fastmcp.utilities.logging import get_logger
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+from sync.engine import SyncEngine, sync_engine
+
+logger = get_logger(__name__)
+
+URI_PREFIX = "mcv://course"
+
+
+class ResourceSubscriptions:
+    def __init__(self, engine: SyncEngine):
+        # (user_id, uri) -> sessions; sessions vanish when their client disconnects
+        self._subscribers: dict[tuple[str, str], weakref.WeakSet[ServerSession]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        engine.listeners.append(self.on_sync)
+
+    def subscribe(self, user_id: str, uri: str, session: ServerSession) -> None:
+        self._subscribers.setdefault((user_id, uri), weakref.WeakSet()).add(session)
+
+    def unsubscribe(self, user_id: str, uri: str, session: ServerSession) -> None:
+        sessions = self._subscribers.get((user_id, uri))
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._subscribers[(user_id, uri)]
+
+    def __len__(self) -> int:
+        return sum(len(sessions) for sessions in self._subscribers.values())
+
+    def on_sync(self, user_id: str, summary: dict) -> None:
+        for change in summary["changed"]:
+            uri = f"{URI_PREFIX}/{change['cv_cid']}/{change['kind']}"
+            for session in list(self._subscribers.get((user_id, uri), ())):
+                task = asyncio.ensure_future(self._notify(session, uri))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _notify(self, session: ServerSession, uri: str) -> None:
+        try:
+            await session.send_resource_updated(AnyUrl(uri))
+        except Exception as e:
+            logger.debug("Could not notify %s about %s: %s", session, uri, e)
+
+
+resource_subscriptions = ResourceSubscriptions(sync_engine)
@@ -0,0 +1,127 @@
+"""Smaller tool-call responses on the wire.
+
+Tool results reach streamable-HTTP clients as SSE events, which Starlette's
+``GZipMiddleware`` never compresses because its gzip stream only emits data
+once enough input has been buffered. ``CompressionMiddleware`` gzips event
+streams too, flushing after every chunk so each event reaches the client as
+soon as it is sent; JSON responses (``json_response`` mode) are compressed the
+same way.
+
+FastMCP also attaches a structured copy of every dict result next to its JSON
+text, so each result is sent twice. ``ResultMiddleware`` drops that copy when
+``TOOL_STRUCTURED_CONTENT`` is off and the tool declares no output schema,
+which the MCP spec only requires structured content for.
+"""
+
+from __future__ import annotations
+
+import zlib
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware import Middleware as ASGIMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.contants import (
+    HTTP_COMPRESSION,
+    HTTP_COMPRESSION_LEVEL,
+    HTTP_COMPRESSION_MIN_SIZE,
+)
+
+
+class _GZipResponder:
+    """Gzip one response, flushing the compressor after every body chunk."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.send: Send | None = None
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk decides the headers.
+            self.start = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message["type"] != "http.response.body":
+            # e.g. http.response.pathsend, which is sent as is
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        first = self.start is not None
+        if first and not self.passthrough and (more_body or len(body) >= self.minimum_size):
+            self.compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+        if self.compressor is not None:
+            mode = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+            body = self.compressor.compress(body) + self.compressor.flush(mode)
+            message = {**message, "body": body}
+        if first:
+            if self.compressor is not None:
+                headers = MutableHeaders(raw=self.start["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+            await self._send_start()
+        await self.send(message)
+
+    async def _send_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+
+class CompressionMiddleware:
+    """Gzip responses, including SSE streams, for clients that accept it."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+        responder = _GZipResponder(self.app, self.minimum_size, self.compresslevel)
+        await responder(scope, receive, send)
+
+
+def http_middleware() -> list[ASGIMiddleware]:
+    """ASGI middleware for ``mcp.http_app`` / ``mcp.run``."""
+    if not HTTP_COMPRESSION:
+        return []
+    return [
+        ASGIMiddleware(
+            CompressionMiddleware,
+            minimum_size=HTTP_COMPRESSION_MIN_SIZE,
+            compresslevel=HTTP_COMPRESSION_LEVEL,
+        )
+    ]
+
+
+class ResultMiddleware(Middleware):
+    def __init__(self, structured_content: bool = True):
+        self.structured_content = structured_content
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        result = await call_next(context)
+        if self.structured_content or result.structured_content is None:
+            return result
+        tool = await context.fastmcp_context.fastmcp.get_tool(context.message.name)
+        if tool.output_schema is None:
+            result.structured_content = None
+        return result
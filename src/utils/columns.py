@@ -0,0 +1,60 @@
+"""Column-oriented aggregation over list payloads such as a course roster.
+
+Rows are transposed once into one list per field. Filters build a boolean
+mask column by column and counts come from ``Counter`` over the (zipped)
+group columns, so summaries of a few hundred students never build per-row
+intermediate dicts.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from itertools import compress
+
+from utils.fastjson import dumps
+
+
+def _norm(value) -> str:
+    return str(value).strip().casefold() if value is not None else ""
+
+
+class Table:
+    def __init__(self, columns: dict[str, list], size: int):
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_rows(cls, rows: list) -> "Table":
+        rows = [row for row in rows if isinstance(row, dict)]
+        names = list(dict.fromkeys(key for row in rows for key in row))
+        return cls({name: [row.get(name) for row in rows] for name in names}, len(rows))
+
+    def column(self, name: str) -> list:
+        return self.columns.get(name) or [None] * self.size
+
+    def where(self, conditions: dict[str, str | list[str]] | None) -> "Table":
+        """Rows whose fields equal (case-insensitively) one of the given values."""
+        if not conditions:
+            return self
+        mask = [True] * self.size
+        for name, expected in conditions.items():
+            allowed = {_norm(v) for v in (expected if isinstance(expected, list) else [expected])}
+            mask = [keep and _norm(value) in allowed for keep, value in zip(mask, self.column(name))]
+        return Table(
+            {name: list(compress(values, mask)) for name, values in self.columns.items()},
+            sum(mask),
+        )
+
+    def _group_column(self, name: str) -> list:
+        """``column`` with list and dict values (nested section or group data) as JSON text."""
+        return [dumps(v) if isinstance(v, (list, dict)) else v for v in self.column(name)]
+
+    def counts(self, by: list[str]) -> Counter:
+        """Row counts per value of ``by`` (a tuple of values when grouping by several)."""
+        if len(by) == 1:
+            return Counter(self._group_column(by[0]))
+        return Counter(zip(*(self._group_column(name) for name in by)))
+
+    def rows(self) -> list[dict]:
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
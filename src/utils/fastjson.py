@@ -0,0 +1,34 @@
+"""JSON decoding and encoding for upstream bodies and tool results.
+
+Uses orjson when installed (``uv sync --extra fast-json``) and otherwise
+pydantic-core, which FastMCP already depends on. Either decodes several times
+faster than the stdlib ``json`` module that ``httpx.Response.json`` uses. For
+encoding, the pydantic-core ``dumps`` is what FastMCP's default tool
+serializer already does, so as ``tool_serializer`` it only helps with orjson.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+import pydantic_core
+
+BACKEND = "orjson" if orjson is not None else "pydantic-core"
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return pydantic_core.from_json(data)
+
+
+def dumps(value: Any) -> str:
+    """Compact JSON text; values JSON has no type for are encoded with ``str``."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return pydantic_core.to_json(value, fallback=str).decode()
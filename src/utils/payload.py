@@ -0,0 +1,39 @@
+"""Helpers for reading MyCourseVille response payloads."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+
+def records(payload) -> list:
+    """Return the list of records inside a MyCourseVille response."""
+    data = payload.get("data", payload) if isinstance(payload, dict) else payload
+    if isinstance(data, dict):
+        # /get/user/courses groups courses by role (student, ta, instructor, ...)
+        return [item for group in data.values() if isinstance(group, list) for item in group]
+    return data if isinstance(data, list) else []
+
+
+def timestamp(item: dict, *fields: str) -> float | None:
+    """Unix time from the first of ``fields`` holding a number or ISO date."""
+    for field in fields:
+        value = item.get(field)
+        if value in (None, "", 0, "0"):
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def course_summary(course: dict) -> dict:
+    return {
+        "cv_cid": course.get("cv_cid"),
+        "course_no": course.get("course_no"),
+        "title": course.get("title"),
+    }
@@ -0,0 +1,35 @@
+"""MCP progress notifications from inside tools."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastmcp.server.dependencies import get_context
+
+_muted: ContextVar[bool] = ContextVar("progress_muted", default=False)
+
+
+async def report_progress(progress: float, total: float | None = None, message: str | None = None) -> None:
+    """Send a progress notification if the current request asked for them.
+
+    A no-op outside a request (e.g. when a controller is called directly),
+    when the client sent no progress token, or inside ``muted``.
+    """
+    if _muted.get():
+        return
+    try:
+        ctx = get_context()
+        await ctx.report_progress(progress, total, message)
+    except (RuntimeError, ValueError, LookupError):
+        pass
+
+
+@contextmanager
+def muted():
+    """Silence the progress of tools called by another tool, which reports its own."""
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
@@ -0,0 +1,124 @@
+"""Server-side trimming of large MyCourseVille list payloads.
+
+Tools that return lists (materials, assignments, announcements, roster) keep
+only a compact set of fields per item by default, can strip HTML out of
+descriptions and page through the list, so less JSON is serialized and sent
+to the model.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from collections.abc import Iterable
+from itertools import islice
+
+from fastmcp.exceptions import ToolError
+
+# Fields kept per item when the caller does not ask for specific ones.
+COMPACT_FIELDS: dict[str, tuple[str, ...]] = {
+    "materials": (
+        "itemid", "cv_cid", "title", "description", "created", "changed",
+        "filename", "fileurl", "link",
+    ),
+    "assignments": (
+        "itemid", "cv_cid", "title", "instruction", "duetime", "duedate",
+        "status", "created",
+    ),
+    "announcements": (
+        "itemid", "cv_cid", "title", "content", "createdtime", "created",
+    ),
+    "roster": (
+        "uid", "student_id", "firstname_en", "lastname_en", "firstname_th",
+        "lastname_th", "department", "year", "section", "role",
+    ),
+}
+
+ALL_FIELDS = "*"
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+
+
+def strip_html(value: str) -> str:
+    return _SPACE.sub(" ", html.unescape(_TAG.sub(" ", value))).strip()
+
+
+def project_item(item: dict, fields: tuple[str, ...] | None, strip: bool) -> dict:
+    if fields is not None:
+        picked = {f: item[f] for f in fields if f in item}
+        # Unknown shape: better to return the whole item than an empty one.
+        item = picked or item
+    if strip:
+        item = {
+            k: strip_html(v) if isinstance(v, str) and "<" in v else v
+            for k, v in item.items()
+        }
+    return item
+
+
+def project(
+    payload,
+    schema: str,
+    *,
+    fields: list[str] | None = None,
+    strip: bool = True,
+    limit: int | None = None,
+    cursor: str | None = None,
+):
+    """Apply field selection, HTML stripping and pagination to ``payload``.
+
+    ``fields=None`` keeps the compact schema for ``schema``; ``["*"]`` keeps
+    every field. ``cursor`` is the ``next_cursor`` of a previous page.
+    """
+    data = payload.get("data") if isinstance(payload, dict) else payload
+    if not isinstance(data, list):
+        return payload
+
+    if fields is None:
+        selected = COMPACT_FIELDS.get(schema)
+    elif ALL_FIELDS in fields:
+        selected = None
+    else:
+        selected = tuple(fields)
+
+    page, next_cursor = paginate(data, limit, cursor)
+    page = [
+        project_item(item, selected, strip) if isinstance(item, dict) else item
+        for item in page
+    ]
+
+    result = {k: v for k, v in payload.items() if k != "data"} if isinstance(payload, dict) else {}
+    result["data"] = page
+    result["total"] = len(data)
+    result["next_cursor"] = next_cursor
+    return result
+
+
+def paginate(items: list, limit: int | None, cursor: str | None) -> tuple[list, str | None]:
+    """Slice one page out of ``items``; returns the page and the next cursor."""
+    return page_of(items, len(items), limit, cursor)
+
+
+def page_of(
+    items: Iterable, total: int, limit: int | None, cursor: str | None
+) -> tuple[list, str | None]:
+    """``paginate`` for an iterable of ``total`` items, consumed only up to the page end."""
+    if limit is not None and limit < 1:
+        # An empty page would hand back the same cursor forever.
+        raise ToolError(f"limit must be at least 1, got {limit}")
+    start = _offset(cursor)
+    end = total if limit is None else start + limit
+    return list(islice(items, start, end)), str(end) if end < total else None
+
+
+def _offset(cursor: str | None) -> int:
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError:
+        raise ToolError(f"Invalid cursor: {cursor!r}") from None
+    if offset < 0:
+        raise ToolError(f"Invalid cursor: {cursor!r}")
+    return offset
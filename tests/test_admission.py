@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, Busy
+
+
+def _controller(**kwargs) -> AdmissionController:
+    options = {"max_concurrent": 1, "user_concurrency": 1, "queue_timeout": 5}
+    return AdmissionController(**{**options, **kwargs})
+
+
+async def _queue(controller, user_id, cost=1) -> asyncio.Task:
+    task = asyncio.create_task(controller.acquire(user_id, cost))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_shed_call_gives_its_cost_back():
+    controller = _controller(queue_timeout=0.05)
+    await controller.acquire("a")
+    with pytest.raises(Busy):
+        await controller.acquire("a", 3)
+    assert controller._users["a"].finish == 1
+    assert controller.queued == 0
+    assert controller.stats()["rejected"] == 1
+
+
+async def test_cancelled_call_moves_later_calls_forward():
+    controller = _controller()
+    await controller.acquire("a")
+    first = await _queue(controller, "a", 1)
+    middle = await _queue(controller, "a", 2)
+    last = await _queue(controller, "a", 1)
+    user = controller._users["a"]
+    assert [w.tag for w in user.queue] == [1, 2, 4]
+
+    middle.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await middle
+    assert [w.tag for w in user.queue] == [1, 2]
+    assert user.finish == 3
+
+    controller.release("a")
+    await first
+    controller.release("a")
+    await last
+    controller.release("a")
+    assert controller.stats() == {"running": 0, "queued": 0, "users": 0, "admitted": 3, "rejected": 0}
+
+
+async def test_full_queue_sheds_new_calls():
+    controller = _controller(max_queue=1)
+    await controller.acquire("a")
+    waiting = await _queue(controller, "b")
+    with pytest.raises(Busy, match="busy"):
+        await controller.acquire("c")
+    assert "c" not in controller._users
+
+    controller.release("a")
+    await waiting
+    controller.release("b")
+    assert controller.stats()["rejected"] == 1
+
+
+async def test_user_queue_limit_only_sheds_that_user():
+    controller = _controller(max_concurrent=2, user_queue=1)
+    await controller.acquire("a")
+    waiting = await _queue(controller, "a")
+    with pytest.raises(Busy, match="for this user"):
+        await controller.acquire("a")
+    await controller.acquire("b")
+    assert controller.stats()["running"] == 2
+
+    controller.release("b")
+    controller.release("a")
+    await waiting
+    controller.release("a")
+
+
+async def test_per_user_concurrency_lets_others_through():
+    controller = _controller(max_concurrent=4, user_concurrency=2)
+    await controller.acquire("a")
+    await controller.acquire("a")
+    waiting = await _queue(controller, "a")
+    await controller.acquire("b")
+    assert not waiting.done()
+    assert controller.stats()["running"] == 3
+
+    controller.release("a")
+    await waiting
+    for user in ("a", "a", "b"):
+        controller.release(user)
+
+
+async def test_slots_are_shared_in_proportion_to_cost():
+    # "heavy" queues four cost-4 calls before "light" queues four cost-1
+    # calls; weighted fair queuing interleaves them by cost, not arrival.
+    controller = _controller()
+    await controller.acquire("other")
+    order = []
+
+    async def call(user, cost):
+        await controller.acquire(user, cost)
+        order.append(user)
+        await asyncio.sleep(0)
+        controller.release(user)
+
+    tasks = [asyncio.create_task(call("heavy", 4)) for _ in range(4)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(call("light", 1)) for _ in range(4)]
+    await asyncio.sleep(0)
+    controller.release("other")
+    await asyncio.gather(*tasks)
+    assert order[:5] == ["heavy", "light", "light", "light", "light"]
+
+
+async def test_cancelled_waiter_granted_a_slot_gives_it_back():
+    controller = _controller()
+    await controller.acquire("a")
+    waiting = await _queue(controller, "b")
+    controller.release("a")
+    waiting.cancel()
+    try:
+        await waiting
+    except asyncio.CancelledError:
+        pass
+    else:
+        # Before 3.12, wait_for returns the result instead of raising when
+        # the slot was granted first; the caller then holds and releases it.
+        controller.release("b")
+    assert controller.stats()["running"] == 0
+    assert controller.stats()["users"] == 0
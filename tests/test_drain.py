@@ -0,0 +1,53 @@
+import asyncio
+import signal
+
+import pytest
+import uvicorn
+from fastmcp.exceptions import ToolError
+
+from drain import DrainingServer, drain
+
+
+@pytest.fixture(autouse=True)
+def idle_drain():
+    yield
+    drain.in_flight = 0
+    drain.draining = False
+
+
+def _server(timeout: float = 5) -> DrainingServer:
+    return DrainingServer(uvicorn.Config(app=None), timeout)
+
+
+async def test_exits_at_once_when_idle():
+    server = _server()
+    server.handle_exit(signal.SIGTERM, None)
+    assert server.should_exit
+    assert drain.draining
+
+
+async def test_waits_for_in_flight_calls():
+    server = _server()
+    drain.in_flight = 1
+    server.handle_exit(signal.SIGTERM, None)
+    await asyncio.sleep(0.1)
+    assert drain.draining
+    assert not server.should_exit
+
+    drain.in_flight = 0
+    await asyncio.sleep(0.1)
+    assert server.should_exit
+
+
+async def test_second_signal_exits_immediately():
+    server = _server()
+    drain.in_flight = 1
+    server.handle_exit(signal.SIGTERM, None)
+    server.handle_exit(signal.SIGTERM, None)
+    assert server.should_exit
+
+
+async def test_new_calls_are_refused_while_draining():
+    drain.draining = True
+    with pytest.raises(ToolError):
+        await drain.on_call_tool(None, None)
@@ -0,0 +1,84 @@
+import pytest
+
+from controllers import courses
+
+
+def _course(cv_cid: str) -> dict:
+    return {"cv_cid": cv_cid, "course_no": f"C{cv_cid}", "title": f"Course {cv_cid}"}
+
+
+@pytest.fixture
+def enrolled(monkeypatch):
+    """Enroll in courses whose items are given as {cv_cid: [duetime, ...]}."""
+
+    def enroll(items: dict[str, list[int]]):
+        async def enrolled_courses(refresh):
+            return [_course(cv_cid) for cv_cid in items]
+
+        monkeypatch.setattr(courses, "_enrolled_courses", enrolled_courses)
+
+        async def fetch(cv_cid, refresh=False):
+            return {"data": [{"itemid": f"{cv_cid}-{t}", "duetime": t} for t in items[cv_cid]]}
+
+        return fetch
+
+    return enroll
+
+
+async def _page(fetch, limit=None, cursor=None):
+    return await courses._fan_out(
+        fetch, ("duetime",), newest_first=False, refresh=False,
+        limit=limit, cursor=cursor, resource="assignments",
+    )
+
+
+async def test_merges_courses_in_order(enrolled):
+    fetch = enrolled({"1": [30, 10], "2": [20]})
+    result = await _page(fetch)
+    assert [i["itemid"] for i in result["items"]] == ["1-10", "2-20", "1-30"]
+    assert result["item_count"] == 3
+    assert result["next_cursor"] is None
+    assert "remaining" not in result
+
+
+async def test_pages_concatenate_to_the_whole_list(enrolled):
+    fetch = enrolled({"1": [1, 4, 7], "2": [2, 5], "3": [3, 6, 8, 9]})
+    whole = [i["itemid"] for i in (await _page(fetch))["items"]]
+    paged, cursor = [], None
+    while True:
+        result = await _page(fetch, limit=2, cursor=cursor)
+        paged += [i["itemid"] for i in result["items"]]
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert paged == whole
+
+
+async def test_remaining_counts_items_buffered_by_the_merge(enrolled):
+    # The merge holds B's only item in its heap while emitting A's first two.
+    fetch = enrolled({"A": [1, 2, 3], "B": [4]})
+    result = await _page(fetch, limit=2)
+    assert [i["itemid"] for i in result["items"]] == ["A-1", "A-2"]
+    remaining = {r["cv_cid"]: r["items"] for r in result["remaining"]}
+    assert remaining == {"A": 1, "B": 1}
+    assert result["remaining"][1]["uri"].endswith("/B/assignments")
+
+
+async def test_remaining_after_an_offset(enrolled):
+    fetch = enrolled({"A": [1, 2, 3], "B": [4]})
+    result = await _page(fetch, limit=1, cursor="2")
+    assert [i["itemid"] for i in result["items"]] == ["A-3"]
+    assert [(r["cv_cid"], r["items"]) for r in result["remaining"]] == [("B", 1)]
+
+
+async def test_failing_course_is_reported(enrolled):
+    fetch = enrolled({"1": [1], "2": [2]})
+
+    async def failing(cv_cid, refresh=False):
+        if cv_cid == "2":
+            raise RuntimeError("upstream down")
+        return await fetch(cv_cid, refresh)
+
+    result = await _page(failing)
+    assert [i["itemid"] for i in result["items"]] == ["1-1"]
+    assert result["errors"] == [{**_course("2"), "error": "upstream down"}]
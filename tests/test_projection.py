@@ -0,0 +1,20 @@
+import pytest
+from fastmcp.exceptions import ToolError
+
+from utils.projection import paginate
+
+
+def test_pages_through_items():
+    assert paginate(list(range(5)), 2, None) == ([0, 1], "2")
+    assert paginate(list(range(5)), 2, "4") == ([4], None)
+
+
+@pytest.mark.parametrize("cursor", ["abc", "-1", "1.5"])
+def test_bad_cursor_is_an_argument_error(cursor):
+    with pytest.raises(ToolError, match="Invalid cursor"):
+        paginate([1, 2, 3], 1, cursor)
+
+
+def test_limit_below_one_is_an_argument_error():
+    with pytest.raises(ToolError):
+        paginate([1, 2, 3], 0, None)
@@ -0,0 +1,91 @@
+import pytest
+
+from controllers import query
+from controllers.query import run_query
+
+COURSES = [
+    {"cv_cid": 1, "year": 2025, "title": "A"},
+    {"cv_cid": 2, "year": 2024, "title": "B"},
+    {"cv_cid": 3, "year": 2025, "title": "C"},
+]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    made = []
+
+    async def list_all_courses(refresh: bool = False):
+        made.append(("courses",))
+        return {"data": {"student": COURSES}}
+
+    async def get_course_assignments(courseId: str, refresh: bool = False):
+        made.append(("assignments", courseId))
+        if courseId == "3":
+            raise RuntimeError("upstream down")
+        return {"data": [{"itemid": f"{courseId}-{n}", "score": n} for n in range(3)]}
+
+    monkeypatch.setitem(query.CALLS, "list_all_courses", list_all_courses)
+    monkeypatch.setitem(query.CALLS, "get_course_assignments", get_course_assignments)
+    return made
+
+
+async def test_for_each_runs_per_filtered_row(calls):
+    result = await run_query([
+        {"id": "courses", "call": "list_all_courses", "where": {"year": 2025}},
+        {"id": "hw", "call": "get_course_assignments", "for_each": "courses",
+         "args": {"courseId": "$.cv_cid"}, "where": {"score": {"gte": 1}}, "fields": ["itemid"]},
+    ])
+    assert list(result["steps"]) == ["hw"]
+    assert result["steps"]["hw"] == {
+        "rows": [{"itemid": "1-1"}, {"itemid": "1-2"}],
+        "total": 2,
+    }
+    assert sorted(calls) == [("assignments", "1"), ("assignments", "3"), ("courses",)]
+    assert result["errors"] == [
+        {"step": "hw", "args": {"courseId": "3", "refresh": False}, "error": "upstream down"}
+    ]
+
+
+async def test_identical_calls_are_made_once(calls):
+    result = await run_query(
+        [
+            {"id": "all", "call": "list_all_courses"},
+            {"id": "again", "call": "list_all_courses", "limit": 1},
+            {"id": "hw", "call": "get_course_assignments", "for_each": "all",
+             "args": {"courseId": "$.cv_cid"}, "limit": 1},
+        ],
+        output=["again", "hw"],
+    )
+    assert calls.count(("courses",)) == 1
+    assert result["deduplicated"] == 1
+    assert result["steps"]["again"]["total"] == 3
+    assert len(result["steps"]["again"]["rows"]) == 1
+    assert result["steps"]["hw"]["rows"][0]["_via"] == {"courseId": "1"}
+
+
+async def test_call_budget(calls, monkeypatch):
+    monkeypatch.setattr(query, "QUERY_MAX_CALLS", 2)
+    result = await run_query([
+        {"id": "courses", "call": "list_all_courses"},
+        {"id": "hw", "call": "get_course_assignments", "for_each": "courses",
+         "args": {"courseId": "$.cv_cid"}},
+    ])
+    assert len(calls) == 2
+    assert [e["error"] for e in result["errors"]].count(
+        "Query needs more than 2 calls; narrow it with where or limit"
+    ) == 2
+
+
+@pytest.mark.parametrize(
+    "steps, message",
+    [
+        ([{"call": "delete_everything"}], "calls 'delete_everything'"),
+        ([{"call": "get_course_assignments", "args": {"courseId": "$.cv_cid"}}], "no for_each"),
+        ([{"call": "get_course_assignments", "for_each": "later"}], "not an earlier step"),
+        ([{"id": "a", "call": "list_all_courses"}, {"id": "a", "call": "list_all_courses"}], "Duplicate"),
+        ([{"call": "list_all_courses", "where": {"year": {"between": 1}}}], "filters 'year'"),
+    ],
+)
+async def test_invalid_plans_are_rejected(steps, message):
+    with pytest.raises(ValueError, match=message):
+        await run_query(steps)
@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from clients import resilience
+from clients.resilience import (
+    CircuitBreaker,
+    RateLimiter,
+    TokenBucket,
+    UpstreamPolicy,
+    UpstreamUnavailable,
+)
+
+
+def test_active_user_keeps_their_bucket():
+    limiter = RateLimiter(rate=1000, burst=1000, user_rate=1, user_burst=2)
+    limiter._users.ttl = 0.2
+    bucket = limiter._user("u")
+    for _ in range(3):
+        time.sleep(0.1)
+        limiter.reserve("u")
+    assert limiter._user("u") is bucket
+    # Three reservations against a burst of 2 at 1/s: the user is now throttled.
+    assert limiter.reserve("u") > 0
+
+
+def test_idle_user_bucket_expires():
+    limiter = RateLimiter(rate=1000, burst=1000, user_rate=1, user_burst=2)
+    limiter._users.ttl = 0.05
+    bucket = limiter._user("u")
+    time.sleep(0.1)
+    assert limiter._user("u") is not bucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.check() is False
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(UpstreamUnavailable, match="retry in 30s"):
+        breaker.check()
+
+
+def test_half_open_breaker_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == "half-open"
+    assert breaker.check() is True
+    with pytest.raises(UpstreamUnavailable, match="recovering"):
+        breaker.check()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.check() is False
+
+
+def test_failed_trial_reopens_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.check() is True
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 30
+    assert breaker.check() is True
+
+
+def test_trial_without_a_verdict_frees_the_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.check() is True
+    breaker.end_probe()
+    assert breaker.check() is True
+
+
+def test_token_bucket_refills_and_adapts(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+    clock.now += 1.5
+    assert bucket.reserve() == 0
+
+    bucket.throttle()
+    assert bucket.rate == 1
+    for _ in range(20):
+        bucket.throttle()
+    assert bucket.rate == bucket.min_rate == 0.2
+    for _ in range(40):
+        bucket.recover()
+    assert bucket.rate == 2
+
+
+def _policy(breaker=None, attempts=3) -> UpstreamPolicy:
+    return UpstreamPolicy(
+        limiter=RateLimiter(rate=1000, burst=1000, user_rate=1000, user_burst=1000),
+        breaker=breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30),
+        attempts=attempts,
+        base_delay=0,
+        max_delay=0,
+    )
+
+
+def _upstream(*statuses):
+    sent = []
+    replies = iter(statuses)
+
+    async def send(timeout):
+        status = next(replies)
+        sent.append(status)
+        if isinstance(status, Exception):
+            raise status
+        return httpx.Response(status)
+
+    return send, sent
+
+
+async def test_policy_retries_retryable_statuses():
+    policy = _policy()
+    send, sent = _upstream(503, 429, 200)
+    resp = await policy.run("/p", "u", send)
+    assert resp.status_code == 200
+    assert sent == [503, 429, 200]
+    assert policy.stats()["retries"] == 2
+    assert policy.stats()["throttled"] == 1
+
+
+async def test_policy_returns_the_last_response_when_attempts_run_out():
+    policy = _policy(attempts=2)
+    send, sent = _upstream(500, 502)
+    resp = await policy.run("/p", "u", send)
+    assert resp.status_code == 502
+    assert len(sent) == 2
+
+
+async def test_policy_reraises_transport_errors():
+    policy = _policy(attempts=2)
+    send, _ = _upstream(httpx.ConnectError("down"), httpx.ConnectError("down"))
+    with pytest.raises(httpx.ConnectError):
+        await policy.run("/p", "u", send)
+
+
+async def test_only_one_call_probes_a_half_open_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    policy = _policy(breaker, attempts=1)
+    release = asyncio.Event()
+
+    async def slow_send(timeout):
+        await release.wait()
+        return httpx.Response(200)
+
+    probe = asyncio.create_task(policy.run("/p", "u", slow_send))
+    await asyncio.sleep(0)
+    send, sent = _upstream(200)
+    with pytest.raises(UpstreamUnavailable):
+        await policy.run("/p", "u", send)
+    assert sent == []
+
+    release.set()
+    assert (await probe).status_code == 200
+    assert breaker.state == "closed"
+
+
+async def test_probe_slot_is_freed_when_the_trial_is_cancelled(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    policy = _policy(breaker, attempts=1)
+
+    async def hang(timeout):
+        await asyncio.Event().wait()
+
+    probe = asyncio.create_task(policy.run("/p", "u", hang))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.check() is True
@@ -0,0 +1,10 @@
+from fastmcp import FastMCP
+
+from routes import resources
+
+
+def test_resource_subscriptions_are_advertised():
+    mcp = FastMCP("test")
+    resources.register(mcp)
+    options = mcp._mcp_server.create_initialization_options()
+    assert options.capabilities.resources.subscribe is True
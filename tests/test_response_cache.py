@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from cache import response
+from cache.response import ResponseCache
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {"data": [{"itemid": self.calls, "title": "x"}]}
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(response.time, "time", lambda: clock[0])
+    return clock
+
+
+async def test_fresh_entries_are_served_from_cache(now):
+    cache = ResponseCache(default_ttl=60, stale_ttl=60)
+    load = Loader()
+    first = await cache.get_or_fetch("u", "/p", {"a": 1}, load)
+    now[0] += 59
+    assert await cache.get_or_fetch("u", "/p", {"a": 1}, load) == first
+    assert load.calls == 1
+    assert cache.stats() == {"hits": 1, "stale_hits": 0, "misses": 1, "size": 1}
+
+
+async def test_stale_entry_is_served_while_it_is_refreshed(now):
+    cache = ResponseCache(default_ttl=60, stale_ttl=60)
+    load = Loader()
+    await cache.get_or_fetch("u", "/p", None, load)
+    now[0] += 90
+    stale = await cache.get_or_fetch("u", "/p", None, load)
+    assert stale["data"][0]["itemid"] == 1
+    await asyncio.gather(*cache._background)
+    assert load.calls == 2
+    fresh = await cache.get_or_fetch("u", "/p", None, load)
+    assert fresh["data"][0]["itemid"] == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+async def test_expired_entry_is_refetched(now):
+    cache = ResponseCache(default_ttl=60, stale_ttl=60)
+    load = Loader()
+    await cache.get_or_fetch("u", "/p", None, load)
+    now[0] += 121
+    result = await cache.get_or_fetch("u", "/p", None, load)
+    assert result["data"][0]["itemid"] == 2
+
+
+async def test_refresh_bypasses_the_cache():
+    cache = ResponseCache()
+    load = Loader()
+    await cache.get_or_fetch("u", "/p", None, load)
+    result = await cache.get_or_fetch("u", "/p", None, load, refresh=True)
+    assert result["data"][0]["itemid"] == 2
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    load = Loader()
+    results = await asyncio.gather(*(cache.get_or_fetch("u", "/p", None, load) for _ in range(5)))
+    assert load.calls == 1
+    assert all(r == results[0] for r in results)
+
+
+async def test_entries_are_per_user_and_params():
+    cache = ResponseCache()
+    load = Loader()
+    await cache.get_or_fetch("u", "/p", {"a": 1}, load)
+    await cache.get_or_fetch("v", "/p", {"a": 1}, load)
+    await cache.get_or_fetch("u", "/p", {"a": 2}, load)
+    assert load.calls == 3
+
+
+async def test_compact_hits_are_independent_copies():
+    cache = ResponseCache(compact=True)
+    load = Loader()
+    await cache.get_or_fetch("u", "/p", None, load)
+    hit = await cache.get_or_fetch("u", "/p", None, load)
+    hit["data"][0]["title"] = "changed"
+    again = await cache.get_or_fetch("u", "/p", None, load)
+    assert again == {"data": [{"itemid": 1, "title": "x"}]}
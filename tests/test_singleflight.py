@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from cache.singleflight import SingleFlight
+
+
+def _call():
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        started.set()
+        await release.wait()
+        return "result"
+
+    return fn, started, release, calls
+
+
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    fn, _, release, calls = _call()
+    waiters = [asyncio.create_task(flight.do("k", fn)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert flight.in_flight("k")
+    release.set()
+    assert await asyncio.gather(*waiters) == ["result"] * 3
+    assert len(calls) == 1
+    assert flight.coalesced == 2
+    assert not flight.in_flight("k")
+
+
+async def test_cancelling_the_leader_does_not_cancel_the_others():
+    flight = SingleFlight()
+    fn, started, release, calls = _call()
+    leader = asyncio.create_task(flight.do("k", fn))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("k", fn))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await follower == "result"
+    assert len(calls) == 1
+
+
+async def test_call_finishes_when_every_waiter_is_cancelled():
+    flight = SingleFlight()
+    fn, started, release, calls = _call()
+    waiter = asyncio.create_task(flight.do("k", fn))
+    await started.wait()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert flight.in_flight("k")
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert not flight.in_flight("k")
+    assert len(flight) == 0
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    waiters = [asyncio.create_task(flight.do("k", failing)) for _ in range(2)]
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert [str(r) for r in results] == ["boom", "boom"]
+    with pytest.raises(RuntimeError):
+        await flight.do("k", failing)
+    assert len(attempts) == 2
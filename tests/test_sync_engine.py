@@ -0,0 +1,31 @@
+from fastmcp.server.auth.auth import AccessToken
+
+from sync import engine as engine_module
+from sync.engine import SyncEngine
+
+
+def _token() -> AccessToken:
+    return AccessToken(token="t", client_id="c", scopes=[], claims={"id": "u1"})
+
+
+async def test_scheduled_sync_reads_through_the_cache(tmp_path, monkeypatch):
+    calls = []
+
+    async def fetch_cached(token, path, params, refresh=False):
+        calls.append((path, refresh))
+        if path == "/get/user/courses":
+            return {"data": {"student": [{"cv_cid": "1"}]}}
+        return {"data": [{"itemid": "a", "created": 1}]}
+
+    monkeypatch.setattr(engine_module, "fetch_cached", fetch_cached)
+    engine = SyncEngine(tmp_path / "sync.sqlite3")
+
+    summary = await engine.ensure_synced(_token())
+    assert summary["added"] == 3
+    assert len(calls) == 4
+    assert not any(refresh for _, refresh in calls)
+
+    calls.clear()
+    await engine.ensure_synced(_token(), refresh=True)
+    assert len(calls) == 4
+    assert all(refresh for _, refresh in calls)
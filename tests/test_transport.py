@@ -0,0 +1,69 @@
+import gzip
+import zlib
+
+from transport import CompressionMiddleware
+
+
+def _app(content_type: str, chunks: list[bytes], headers: list | None = None):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type.encode()), *(headers or [])],
+        })
+        for n, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": n < len(chunks) - 1})
+
+    return app
+
+
+async def _call(app, accept_encoding: str = "gzip") -> list[dict]:
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    await CompressionMiddleware(app, minimum_size=10)(scope, None, send)
+    return sent
+
+
+def _headers(start: dict) -> dict:
+    return {k.decode().lower(): v.decode() for k, v in start["headers"]}
+
+
+async def test_each_event_decodes_as_soon_as_it_is_sent():
+    events = [b"data: %d %s\n\n" % (n, b"x" * 200) for n in range(3)] + [b""]
+    start, *bodies = await _call(_app("text/event-stream", events))
+    assert _headers(start)["content-encoding"] == "gzip"
+    decoder = zlib.decompressobj(31)
+    for event, message in zip(events, bodies):
+        assert decoder.decompress(message["body"]) == event
+    assert decoder.eof
+
+
+async def test_single_body_gets_its_compressed_length():
+    body = b'{"result": "' + b"y" * 500 + b'"}'
+    start, message = await _call(_app("application/json", [body], [(b"content-length", b"514")]))
+    headers = _headers(start)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(message["body"])
+    assert gzip.decompress(message["body"]) == body
+
+
+async def test_small_and_already_encoded_bodies_pass_through():
+    start, message = await _call(_app("application/json", [b"{}"]))
+    assert "content-encoding" not in _headers(start)
+    assert message["body"] == b"{}"
+
+    encoded = [(b"content-encoding", b"br")]
+    start, message = await _call(_app("application/json", [b"z" * 100], encoded))
+    assert _headers(start)["content-encoding"] == "br"
+    assert message["body"] == b"z" * 100
+
+
+async def test_clients_without_gzip_get_identity():
+    start, message = await _call(_app("application/json", [b"z" * 100]), accept_encoding="br")
+    assert "content-encoding" not in _headers(start)
+    assert message["body"] == b"z" * 100
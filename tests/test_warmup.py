@@ -0,0 +1,53 @@
+from fastmcp.server.auth.auth import AccessToken
+
+from cache import warmup as warmup_module
+from cache.response import ResponseCache
+from cache.warmup import Warmup
+
+COURSES = {"data": {"student": [{"cv_cid": str(n), "year": 2025, "semester": 1} for n in range(3)]}}
+
+
+def _token() -> AccessToken:
+    return AccessToken(token="t", client_id="c", scopes=[], claims={"id": "u1"})
+
+
+def _stub(monkeypatch):
+    calls = []
+
+    async def fetch(path, token, params=None):
+        calls.append((path, (params or {}).get("cv_cid")))
+        return COURSES if path == "/get/user/courses" else {"data": []}
+
+    monkeypatch.setattr(warmup_module.mcv, "fetch", fetch)
+    monkeypatch.setattr(warmup_module, "response_cache", ResponseCache())
+    return calls
+
+
+async def test_budget_counts_upstream_requests_only(monkeypatch):
+    calls = _stub(monkeypatch)
+    warmup = Warmup(endpoints=["/get/course/info"], max_requests=3, concurrency=1)
+
+    # The course list and two courses are cached already: only one request goes upstream
+    cache = warmup_module.response_cache
+    await cache.get_or_fetch("u1", "/get/user/courses", {"detail": 1}, _value(COURSES))
+    for cv_cid in ("2", "1"):
+        await cache.get_or_fetch("u1", "/get/course/info", {"cv_cid": cv_cid}, _value({}))
+
+    assert await warmup.run(_token()) == 1
+    assert calls == [("/get/course/info", "0")]
+    assert warmup.stats()["requests"] == 1
+
+
+async def test_stops_at_the_budget(monkeypatch):
+    calls = _stub(monkeypatch)
+    warmup = Warmup(endpoints=["/get/course/info", "/get/course/materials"], max_requests=4)
+    assert await warmup.run(_token()) == 4
+    assert len(calls) == 4
+    assert calls[0] == ("/get/user/courses", None)
+
+
+def _value(value):
+    async def load():
+        return value
+
+    return load